@@ -0,0 +1,602 @@
+"""
+Benchmarks for the departure board that run without a display or a TfL API key.
+
+Run them from the src directory, for example:
+
+    python benchmarks.py jitter
+    python benchmarks.py jitter --predictions 20000 --duration 20
+    python benchmarks.py stream --clients 100
+    python benchmarks.py snapshot --writers 8 --readers 8
+    python benchmarks.py dns
+"""
+
+# --- IMPORTS ---
+import argparse
+import http.server
+import itertools
+import json
+import math
+import multiprocessing
+import queue
+import socket
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta
+
+import pytz
+from PIL import Image, ImageDraw
+
+import main
+
+
+# --- SYNTHETIC DATA ---
+
+SYNTHETIC_LINES = [
+    ("piccadilly", "Piccadilly", "Cockfosters", "Heathrow Terminal 5"),
+    ("district", "District", "Upminster", "Richmond"),
+    ("circle", "Circle", "Edgware Road (Circle Line)", "Hammersmith (H&C Line)"),
+]
+
+SYNTHETIC_FILTERS = (
+    {("piccadilly", "eastbound"), ("district", "eastbound")},
+    {("piccadilly", "westbound"), ("district", "westbound")},
+)
+
+
+def make_synthetic_payload(n_predictions: int) -> bytes:
+    """Builds a TfL StopPoint/Arrivals style JSON payload with n_predictions entries."""
+    now = datetime.now(pytz.utc)
+    predictions = []
+    for i in range(n_predictions):
+        line_id, line_name, east_destination, west_destination = SYNTHETIC_LINES[
+            i % len(SYNTHETIC_LINES)
+        ]
+        eastbound = i % 2 == 0
+        time_to_station = 60 + (i * 37) % 3600
+        destination = east_destination if eastbound else west_destination
+        predictions.append(
+            {
+                "$type": "Tfl.Api.Presentation.Entities.Prediction, Tfl.Api.Presentation.Entities",
+                "id": str(-1000000 + i),
+                "operationType": 1,
+                "vehicleId": str(100 + i % 900),
+                "naptanId": "940GZZLUSKS",
+                "stationName": "South Kensington Underground Station",
+                "lineId": line_id,
+                "lineName": line_name,
+                "platformName": (
+                    "Eastbound - Platform 1" if eastbound else "Westbound - Platform 2"
+                ),
+                "direction": "outbound" if eastbound else "inbound",
+                "bearing": "",
+                "destinationNaptanId": "940GZZLUXXX",
+                "destinationName": destination + " Underground Station",
+                "timestamp": now.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                "timeToStation": time_to_station,
+                "currentLocation": "Approaching Gloucester Road",
+                "towards": destination,
+                "expectedArrival": (now + timedelta(seconds=time_to_station)).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                ),
+                "timeToLive": (now + timedelta(seconds=time_to_station)).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                ),
+                "modeName": "tube",
+                "timing": {
+                    "$type": "Tfl.Api.Presentation.Entities.PredictionTiming, Tfl.Api.Presentation.Entities",
+                    "countdownServerAdjustment": "00:00:00",
+                    "source": "0001-01-01T00:00:00",
+                    "insert": "0001-01-01T00:00:00",
+                    "read": now.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                    "sent": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "received": "0001-01-01T00:00:00Z",
+                },
+            }
+        )
+    return json.dumps(predictions).encode()
+
+
+def parse_payload(payload: bytes) -> tuple:
+    """Parses a payload the same way get_arrivals does, for both sets of lines."""
+    return tuple(
+        main.format_arrivals(
+            main.filter_predictions(json.loads(payload), filter_criteria_set)
+        )
+        for filter_criteria_set in SYNTHETIC_FILTERS
+    )
+
+
+# --- JITTER BENCHMARK ---
+
+
+def _parse_thread_loop(payload: bytes, interval: float, stop_event: threading.Event):
+    while not stop_event.is_set():
+        main.publish_arrivals(*parse_payload(payload))
+        stop_event.wait(interval)
+
+
+def _parse_process_loop(payload: bytes, interval: float, stop_event, conn):
+    while not stop_event.is_set():
+        arrivals1, arrivals2 = parse_payload(payload)
+        conn.send(
+            ("arrivals", main.pack_arrivals(arrivals1), main.pack_arrivals(arrivals2))
+        )
+        stop_event.wait(interval)
+    conn.close()
+
+
+class DummyDevice:
+    """Stands in for the SSD1322 display, accepting frames without any hardware."""
+
+    mode = "RGB"
+    size = (256, 64)
+    width, height = size
+
+    def display(self, image: Image.Image):
+        image.tobytes()  # Roughly the cost of luma preparing the frame for SPI
+
+
+def measure_display_loop(
+    duration: float,
+    fps: int = 5,
+    streamer: main.FrameStreamer = None,
+) -> tuple:
+    """
+    Runs a display loop like main() that draws the clock at a fixed rate.
+    Returns how late (in seconds) each frame started compared to its schedule,
+    and how long (in seconds) each frame took to draw, display and hand over.
+    """
+    device = DummyDevice()
+    buffer = Image.new(device.mode, device.size)
+    draw_handle = ImageDraw.Draw(buffer)
+    frame_time_budget = 1.0 / fps
+    lateness = []
+    frame_times = []
+    start = time.monotonic()
+    frame = 0
+    while time.monotonic() - start < duration:
+        scheduled = start + frame * frame_time_budget
+        now = time.monotonic()
+        if now < scheduled:
+            time.sleep(scheduled - now)
+            now = time.monotonic()
+        lateness.append(now - scheduled)
+        main.draw_clock(draw_handle, font=main.fontBold)
+        device.display(buffer)
+        if streamer:
+            streamer.submit(buffer)
+        frame_times.append(time.monotonic() - now)
+        frame += 1
+    return lateness, frame_times
+
+
+def run_jitter_mode(
+    mode: str, payload: bytes, duration: float, interval: float
+) -> list:
+    if mode == "process":
+        stop_event = multiprocessing.Event()
+        receive_conn, send_conn = multiprocessing.Pipe(duplex=False)
+        worker = multiprocessing.Process(
+            target=_parse_process_loop,
+            args=(payload, interval, stop_event, send_conn),
+            daemon=True,
+        )
+        worker.start()
+        send_conn.close()
+        receiver = threading.Thread(
+            target=main.arrival_pipe_worker, args=(receive_conn,), daemon=True
+        )
+        receiver.start()
+    else:
+        stop_event = threading.Event()
+        worker = threading.Thread(
+            target=_parse_thread_loop, args=(payload, interval, stop_event), daemon=True
+        )
+        worker.start()
+
+    try:
+        return measure_display_loop(duration)[0]
+    finally:
+        stop_event.set()
+        worker.join(timeout=10)
+
+
+def summarise_times(label: str, durations: list):
+    durations_ms = sorted(value * 1000 for value in durations)
+    p95 = durations_ms[max(0, math.ceil(len(durations_ms) * 0.95) - 1)]
+    print(
+        f"{label:>12}: {len(durations_ms)} frames, "
+        f"mean {statistics.mean(durations_ms):6.2f} ms, "
+        f"p95 {p95:6.2f} ms, "
+        f"max {durations_ms[-1]:6.2f} ms, "
+        f"stdev {statistics.pstdev(durations_ms):6.2f} ms"
+    )
+
+
+def benchmark_jitter(args):
+    """Compares clock frame lateness with parsing in a thread and in a child process."""
+    main.initialize_fonts()
+    main.clock_display_rect = (0, 50, 256, 64)
+    payload = make_synthetic_payload(args.predictions)
+    print(
+        f"Synthetic payload: {args.predictions} predictions, {len(payload) / 1024:.0f} kB, "
+        f"parsed every {args.interval}s for {args.duration}s per mode."
+    )
+    print("Frame lateness:")
+    summarise_times("idle", measure_display_loop(args.duration)[0])
+    for mode in ("thread", "process"):
+        summarise_times(
+            mode, run_jitter_mode(mode, payload, args.duration, args.interval)
+        )
+
+
+# --- FRAME STREAMING BENCHMARK ---
+
+
+def _stream_client(url: str, stop_event: threading.Event, bytes_received: list):
+    """Reads a stream (or polls a frame) until stop_event is set."""
+    try:
+        if url.endswith(".png"):
+            while not stop_event.is_set():
+                with urllib.request.urlopen(url, timeout=10) as response:
+                    bytes_received.append(len(response.read()))
+                stop_event.wait(0.2)
+        else:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                while not stop_event.is_set():
+                    bytes_received.append(len(response.read1(65536)))
+    except OSError as e:
+        print(f"Stream client for {url} failed: {e}")
+
+
+def benchmark_stream(args):
+    """Compares display loop frame times with and without many frame server viewers."""
+    main.initialize_fonts()
+    main.clock_display_rect = (0, 50, 256, 64)
+    streamer = main.FrameStreamer(DummyDevice.mode, DummyDevice.size)
+    server = main.start_frame_server(streamer, "127.0.0.1", 0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"Display loop frame times, {args.duration}s each:")
+    _, frame_times = measure_display_loop(args.duration, streamer=streamer)
+    summarise_times("no viewers", frame_times)
+
+    stop_event = threading.Event()
+    bytes_received = []
+    paths = ["/stream.mjpg", "/events", "/frame.png"]
+    clients = [
+        threading.Thread(
+            target=_stream_client,
+            args=(base_url + paths[i % len(paths)], stop_event, bytes_received),
+            daemon=True,
+        )
+        for i in range(args.clients)
+    ]
+    for client in clients:
+        client.start()
+    version_before = streamer.version
+    encodes_before = streamer.encode_count
+    _, frame_times = measure_display_loop(args.duration, streamer=streamer)
+    stop_event.set()
+    summarise_times(f"{args.clients} viewers", frame_times)
+    print(
+        f"{len(frame_times)} frames displayed, {streamer.version - version_before} changed, "
+        f"{streamer.encode_count - encodes_before} encodings, "
+        f"{sum(bytes_received) / 1024:.0f} kB served."
+    )
+    server.shutdown()
+
+
+# --- SNAPSHOT STORE BENCHMARK ---
+
+
+class QueuePairSlots:
+    """
+    The pair of maxsize-1 queues that carried the arrivals of lines1 and lines2
+    before main.SnapshotStore, used the same way, for comparison.
+    """
+
+    def __init__(self):
+        self.queue1 = queue.Queue(maxsize=1)
+        self.queue2 = queue.Queue(maxsize=1)
+        self.dropped = 0
+        self.latest = (None, None)  # What the reader last consumed
+
+    def publish(self, value):
+        try:
+            while not self.queue1.empty():
+                self.queue1.get_nowait()
+            self.queue1.put_nowait(value[0])
+            while not self.queue2.empty():
+                self.queue2.get_nowait()
+            self.queue2.put_nowait(value[1])
+        except (queue.Full, queue.Empty):
+            self.dropped += 1
+
+    def read(self):
+        # Like the old Render Worker, an Empty on the second queue keeps the first value
+        value1, value2 = self.latest
+        try:
+            value1 = self.queue1.get_nowait()
+            value2 = self.queue2.get_nowait()
+        except queue.Empty:
+            pass
+        self.latest = (value1, value2)
+        return self.latest
+
+
+class SnapshotSlots:
+    """Adapts main.SnapshotStore to the interface of QueuePairSlots."""
+
+    def __init__(self):
+        self.store = main.SnapshotStore((None, None))
+        self.dropped = 0
+        self.versions_seen = {}  # Reader thread id -> last version read
+        self.version_errors = 0
+
+    def publish(self, value):
+        self.store.publish(value)
+
+    def read(self):
+        version, value = self.store.get()
+        reader = threading.get_ident()
+        if version < self.versions_seen.get(reader, 0):
+            self.version_errors += 1
+        self.versions_seen[reader] = version
+        return value
+
+
+def run_stress(slots, writers: int, readers: int, duration: float) -> dict:
+    """
+    Publishes (n, n) pairs from the writer threads while the reader threads
+    read as fast as they can, and counts reads that got a pair out of step.
+    """
+    sequence = itertools.count(1)
+    stop_event = threading.Event()
+    counts = {"publishes": 0, "publish_time": 0.0, "reads": 0, "read_time": 0.0}
+    counts["torn"] = 0
+    counts_lock = threading.Lock()
+
+    def writer():
+        publishes, publish_time = 0, 0.0
+        while not stop_event.is_set():
+            n = next(sequence)
+            start = time.perf_counter()
+            slots.publish((n, n))
+            publish_time += time.perf_counter() - start
+            publishes += 1
+        with counts_lock:
+            counts["publishes"] += publishes
+            counts["publish_time"] += publish_time
+
+    def reader():
+        reads, read_time, torn = 0, 0.0, 0
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            value1, value2 = slots.read()
+            read_time += time.perf_counter() - start
+            reads += 1
+            if value1 != value2:
+                torn += 1
+        with counts_lock:
+            counts["reads"] += reads
+            counts["read_time"] += read_time
+            counts["torn"] += torn
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible to provoke races
+    try:
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    return counts
+
+
+def measure_render_worker(payload: bytes, duration: float, interval: float) -> dict:
+    """
+    Runs the real Render Worker while a stand-in fetcher publishes the same
+    arrivals every interval and wakes the worker, as the queue-based fetcher did
+    after every fetch. Returns the render counts and the number of fetches.
+    """
+    main.display_device = DummyDevice()
+    main.compute_layout()
+    main.board_targets = {
+        "station_info": {"id": "940GZZLUSKS", "name": "South Kensington"},
+        "lines_filter1": SYNTHETIC_FILTERS[0],
+        "lines_filter2": SYNTHETIC_FILTERS[1],
+    }
+    pause_event = threading.Event()
+    pause_event.set()
+    threading.Thread(
+        target=main.arrival_lines_worker, args=(pause_event,), daemon=True
+    ).start()
+
+    fetches = 0
+    published_before = main.arrivals_snapshot.version
+    start = time.monotonic()
+    while time.monotonic() - start < duration:
+        main.publish_arrivals(*parse_payload(payload))
+        main.publish_line_statuses({})
+        main.render_wakeup_event.set()
+        fetches += 1
+        time.sleep(interval)
+    return {
+        "fetches": fetches,
+        "published": main.arrivals_snapshot.version - published_before,
+        **main.render_counts,
+    }
+
+
+def benchmark_snapshot(args):
+    """
+    Stress tests main.SnapshotStore against the queues it replaced, then
+    counts the renders the Render Worker skips because nothing changed.
+    """
+    main.initialize_fonts()
+    print(
+        f"Stress test: {args.writers} writers and {args.readers} readers "
+        f"for {args.duration}s each:"
+    )
+    for label, slots in (("queues", QueuePairSlots()), ("snapshot", SnapshotSlots())):
+        counts = run_stress(slots, args.writers, args.readers, args.duration)
+        line = (
+            f"{label:>12}: {counts['publishes']} publishes "
+            f"({counts['publish_time'] / max(counts['publishes'], 1) * 1e6:.2f} us each, "
+            f"{slots.dropped} failed), {counts['reads']} reads "
+            f"({counts['read_time'] / max(counts['reads'], 1) * 1e6:.2f} us each), "
+            f"{counts['torn']} out of step"
+        )
+        if isinstance(slots, SnapshotSlots):
+            line += (
+                f", {slots.store.contended_publishes} contended publishes, "
+                f"{slots.version_errors} version errors, "
+                f"final version {slots.store.version}"
+            )
+        print(line)
+
+    payload = make_synthetic_payload(args.predictions)
+    counts = measure_render_worker(payload, args.duration, args.interval)
+    print(
+        f"Render Worker: {counts['fetches']} fetches of unchanged arrivals, "
+        f"{counts['published']} published. {counts['rendered']} renders, "
+        f"{counts['skipped']} wake-ups skipped without rendering "
+        f"(the queues rendered on every wake-up)."
+    )
+
+
+# --- DNS CACHE CHECK ---
+
+DNS_TEST_HOST = "tfl.test"
+
+
+class _EmptyJsonHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"[]")
+
+    def log_message(self, *args):
+        pass
+
+
+def benchmark_dns(args):
+    """
+    Checks that TfL connections fall back to the next cached address when one
+    refuses, and that a host whose cached addresses all fail is resolved again.
+    Only 127.0.0.1 listens, so connections to 127.0.0.2 are refused.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _EmptyJsonHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{DNS_TEST_HOST}:{server.server_address[1]}/StopPoint/Search/x"
+
+    resolved_addresses = []
+    original_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *lookup_args, **kwargs):
+        if host != DNS_TEST_HOST:
+            return original_getaddrinfo(host, port, *lookup_args, **kwargs)
+        return [
+            result
+            for address in resolved_addresses
+            for result in original_getaddrinfo(address, port, *lookup_args, **kwargs)
+        ]
+
+    def request(addresses: list) -> str:
+        resolved_addresses[:] = addresses
+        transport = main.TflTransport()  # A new pool, so a new connection is made
+        try:
+            return str(transport.get(url, timeout=5).status_code)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        finally:
+            transport.session.close()
+
+    main.DNS_CACHE = main.DnsCache()
+    socket.getaddrinfo = getaddrinfo
+    try:
+        checks = [
+            (
+                "falls back to the next cached address",
+                request(["127.0.0.2", "127.0.0.1"]) == "200",
+            ),
+        ]
+        main.DNS_CACHE = main.DnsCache()  # Drop the addresses that worked above
+        error = request(["127.0.0.2"])
+        checks += [
+            ("reports the host name when every address fails", DNS_TEST_HOST in error),
+            ("forgets addresses that all failed", not main.DNS_CACHE.entries),
+            ("resolves the host again afterwards", request(["127.0.0.1"]) == "200"),
+        ]
+    finally:
+        socket.getaddrinfo = original_getaddrinfo
+        server.shutdown()
+
+    for label, passed in checks:
+        print(f"{'ok' if passed else 'FAILED':>6}: {label}")
+    if not all(passed for _, passed in checks):
+        sys.exit(1)
+
+
+# --- ENTRY POINT ---
+
+BENCHMARKS = {
+    "jitter": benchmark_jitter,
+    "stream": benchmark_stream,
+    "snapshot": benchmark_snapshot,
+    "dns": benchmark_dns,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument(
+        "--duration", type=float, default=10, help="Seconds to run each measurement."
+    )
+    parser.add_argument(
+        "--predictions",
+        type=int,
+        default=5000,
+        help="Number of predictions in the synthetic arrivals payload.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between parses of the synthetic payload.",
+    )
+    parser.add_argument(
+        "--clients",
+        type=int,
+        default=50,
+        help="Number of concurrent frame server viewers.",
+    )
+    parser.add_argument(
+        "--writers",
+        type=int,
+        default=4,
+        help="Number of publishing threads in the snapshot stress test.",
+    )
+    parser.add_argument(
+        "--readers",
+        type=int,
+        default=4,
+        help="Number of reading threads in the snapshot stress test.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    BENCHMARKS[args.benchmark](args)
@@ -30,7 +30,8 @@ switch_GPIO_pin = 17 # BCM (Broadcom pin numbering) GPIO pin connected to the to
                      # Change this value to match your switch's connection.
 
 refresh_interval_TFL = 20  # Interval (in seconds) between API requests to TFL for new data.
-refresh_interval_display = 3  # Interval (in seconds) for refreshing the visual content on the OLED display.
+refresh_interval_display = 30  # Longest interval (in seconds) between checks of the arrivals shown on the OLED display.
+                               # Rows are otherwise only redrawn when new data arrives or a countdown changes.
 
 max_pi_temp = 60  # Maximum Raspberry Pi CPU temperature (in Celsius) allowed.
                   # If the temperature exceeds this, the display will pause refreshing
@@ -43,6 +44,34 @@ max_pi_temp = 60  # Maximum Raspberry Pi CPU temperature (in Celsius) allowed.
 # (e.g., in your systemd service file).
 api_key = os.getenv("TFL_API_KEY")
 
+api_base_url = os.getenv("TFL_API_BASE_URL", "https://api.tfl.gov.uk")  # Base URL of the TfL Unified API.
+                                                                      # Set 'TFL_API_BASE_URL' to point the board at a stub server for testing.
+
+
+# --- Line Catalogue and Status Settings ---
+line_modes = ["tube", "dlr", "overground", "elizabeth-line"]  # Transport modes whose lines are downloaded (in one request)
+                                                            # into the local line catalogue used to resolve the lines in lines1 and lines2.
+line_catalogue_file = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".line_catalogue.json"
+)  # Where the line catalogue is cached between restarts.
+line_catalogue_max_age = 7 * 24 * 60 * 60  # Age (in seconds) after which the cached line catalogue is downloaded again.
+
+show_line_status = True  # Show a status row (e.g. "District: Minor Delays") when a monitored line is not running a good service.
+refresh_interval_status = 120  # Interval (in seconds) between line status requests. All monitored lines share one request.
+
+
+# --- Idle Mode Settings ---
+# While idle, the board only shows a dimmed clock and checks for arrivals much less often.
+idle_schedule = []  # Daily periods in which the board idles, as ("HH:MM", "HH:MM") start and end times (London time).
+                    # For example [("00:45", "05:15")] for the hours when most stations are closed.
+                    # A period may span midnight. [] idles only when there are no arrivals (see below).
+idle_after_empty = 30 * 60  # Seconds without any arrivals to show after which the board idles, until trains are found again.
+                            # 0 disables this.
+idle_refresh_interval_TFL = 5 * 60  # Interval (in seconds) between API requests for new data while idle.
+idle_contrast = 16  # Contrast (0-255) of the display while idle.
+idle_wake_duration = 10 * 60  # Seconds the board stays at full cadence after starting or after the switch is toggled,
+                              # even during an idle period.
+
 
 # --- Display Layout Settings ---
 display_settings = {
@@ -54,4 +83,56 @@ display_settings = {
 }
 
 fontSize = 10  # Base font size (in pixels) for the display text.
-               # 10 is generally a good size for 128x64 OLED displays to fit multiple lines.
\ No newline at end of file
+               # 10 is generally a good size for 128x64 OLED displays to fit multiple lines.
+
+# --- Memory Settings ---
+lean_mode = False  # Set to True on low-memory boards (e.g. a Pi Zero with 512MB RAM shared with other services).
+                   # Lean mode trims each arrival prediction down to the fields the board uses while the
+                   # API response is parsed, and collects the garbage straight after each fetch.
+                   # It also fetches in a thread whatever fetch_mode says and never starts the frame server
+                   # (stream_port), as both need extra memory.
+
+memory_report_interval = 0  # Interval (in seconds) between tracemalloc memory reports in the logs.
+                            # 0 disables reporting. Tracing itself adds some memory overhead, so only
+                            # enable it while checking the memory budget of a deployment.
+memory_report_top = 10  # Number of largest allocation sites listed in each memory report.
+
+
+# --- Performance Settings ---
+fetch_mode = "thread"  # How TfL data is fetched and parsed:
+                       # "thread": in a background thread of the display process (lowest memory use).
+                       # "process": in a separate child process, so that parsing large arrival payloads
+                       # never delays the clock or the display updates. Uses more memory.
+
+
+profiler_sample_hz = 100  # Stack samples per second taken by the built-in profiler. 0 disables the profiler.
+                          # Start and stop profiling while the board runs with:
+                          #     sudo systemctl kill -s SIGUSR1 tube-departure-board.service
+                          # The profile is written when profiling stops, as collapsed stacks that
+                          # flamegraph.pl or https://www.speedscope.app can display.
+profiler_output_dir = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "profiles"
+)  # Directory the profiles are written to.
+
+
+# --- Remote Monitoring Settings ---
+stream_port = None  # Port of an optional HTTP server showing what the board displays (e.g. 8080). None disables it.
+                    # http://<pi_ip_address>:<port>/            - a web page with the live display
+                    # http://<pi_ip_address>:<port>/frame.png   - the current frame as a PNG image
+                    # http://<pi_ip_address>:<port>/stream.mjpg - a live MJPEG stream
+                    # http://<pi_ip_address>:<port>/events      - a Server-Sent Events stream of PNG frames
+stream_host = "0.0.0.0"  # Address the frame server listens on. Use "127.0.0.1" to only allow local viewers.
+
+config_watch_interval = 2  # Interval (in seconds) between checks for changes to this file while the board is running.
+                           # Changes are applied without a restart, apart from the display rotation, the switch pin
+                           # and the memory, performance and remote monitoring settings. 0 disables watching.
+
+
+# --- Network Settings ---
+http_pool_size = 2  # Number of connections to the TfL API kept open for reuse, avoiding a new TCP and TLS handshake per request.
+http_keepalive_idle = 30  # Seconds a connection can be idle before TCP keep-alive checks that it is still alive.
+dns_cache_ttl = 300  # Seconds the TfL API's address is cached for. If a lookup fails, the cached address keeps being used.
+circuit_breaker_failures = 5  # Consecutive failed requests to an API endpoint before requests to it are paused.
+circuit_breaker_reset = 60  # Seconds before a paused API endpoint is tried again.
+transport_report_interval = 3600  # Interval (in seconds) between logs of request, handshake and compression statistics.
+                                  # 0 disables the report.
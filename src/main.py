@@ -1,18 +1,37 @@
 # --- IMPORTS ---
 import config
+import tracemalloc
+
+# Start tracing before the remaining imports so that their allocations are
+# included in the memory reports.
+if config.memory_report_interval > 0:
+    tracemalloc.start()
+
+import base64
+import gc
+import importlib.util
+import io
 import os
+import signal
 import time
 import sys
 import requests
+import requests.adapters
 import json
+import socket
+import urllib.parse
 from datetime import datetime
 import math
 import pytz
 import threading
-import queue
+import types
 
 from PIL import ImageFont, ImageDraw, Image
 from luma.core.render import canvas
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family, create_connection
 
 
 # --- CONDITIONAL DISPLAY DRIVER / EMULATOR SETUP ---
@@ -28,21 +47,103 @@ if sys.platform.startswith("linux") and os.uname().machine.startswith("arm"):
         print(
             "Warning: Running on Raspberry Pi but luma.oled drivers not found. Falling back to emulator."
         )
-if not IS_RASPBERRY_PI:
-    from luma.emulator.device import pygame
+# The Pygame emulator is only imported in main() when it is actually needed,
+# so that the board never loads Pygame when running on the Pi.
 
 
 # --- GLOBAL FONT DEFINITIONS ---
 font: ImageFont.FreeTypeFont = None
 fontBold: ImageFont.FreeTypeFont = None
 
-# --- GLOBAL API SESSION & QUEUES FOR THREAD COMMUNICATION ---
-API_SESSION = requests.Session()
-raw_api_data_queue1 = queue.Queue(maxsize=1)
-raw_api_data_queue2 = queue.Queue(maxsize=1)
-# rendered_frames_queue = queue.Queue(maxsize=1)
-rendered_frames_queue1 = queue.Queue(maxsize=1)
-rendered_frames_queue2 = queue.Queue(maxsize=1)
+
+# --- SNAPSHOT STORE ---
+
+
+class SnapshotStore:
+    """
+    A latest-value slot shared between threads. publish() replaces the value
+    and its version number in one assignment, so readers always get a value
+    together with the version it belongs to. Reading never blocks and never
+    consumes the value: readers compare the version with the one they last
+    used to tell whether anything changed.
+    """
+
+    def __init__(self, value=None):
+        self._snapshot = (0, value)
+        self._publish_lock = threading.Lock()  # Keeps versions unique between writers
+        self.contended_publishes = 0  # Publishes that had to wait for another writer
+
+    def publish(self, value) -> int:
+        """Replaces the value and returns its new version."""
+        contended = not self._publish_lock.acquire(blocking=False)
+        if contended:
+            self._publish_lock.acquire()
+        try:
+            version = self._snapshot[0] + 1
+            self._snapshot = (version, value)
+            if contended:
+                self.contended_publishes += 1
+        finally:
+            self._publish_lock.release()
+        return version
+
+    def get(self) -> tuple:
+        """Returns (version, value) of the latest snapshot."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot[0]
+
+    @property
+    def value(self):
+        return self._snapshot[1]
+
+
+# --- GLOBAL SNAPSHOTS FOR THREAD COMMUNICATION (the API transport is TFL_TRANSPORT) ---
+arrivals_snapshot = SnapshotStore(([], []))  # Arrivals of lines1 and lines2
+line_status_snapshot = SnapshotStore({})
+rendered_frames_snapshot = SnapshotStore((None, None))  # Frames of lines1 and lines2
+
+# --- GLOBAL LINE CATALOGUE (see get_line_catalogue) ---
+line_catalogue: dict = None
+line_catalogue_next_attempt = 0  # Epoch time before which not to retry a refresh
+LINE_CATALOGUE_RETRY_INTERVAL = 60 * 60  # Seconds to wait after a failed refresh
+GOOD_SERVICE_SEVERITY = 10  # TfL statusSeverity for "Good Service"
+
+# --- GLOBAL STATION AND LINE FILTERS ---
+# {"station_info", "lines_filter1", "lines_filter2"}. Replaced as a whole (never
+# mutated) when the config is reloaded, so workers always read a consistent set.
+board_targets: dict = None
+resolved_line_entries = {}  # (line, direction) config entry -> resolved filter pair
+
+# --- GLOBAL CONFIG RELOAD STATE ---
+# Held while applying a reloaded config and while drawing with it
+config_lock = threading.Lock()
+layout_version = 0  # Incremented by compute_layout() whenever the geometry changes
+config_version = 0  # Incremented whenever a reloaded config is applied
+fetch_wakeup_event = threading.Event()  # Wakes the API Fetch Worker after a reload
+fetch_control_conn = None  # Sends reloads to the API Fetch Process ("process" mode)
+fetch_control_lock = threading.Lock()  # Held while sending on fetch_control_conn
+FETCH_PROCESS_RESTART_DELAY = (
+    10  # Seconds before an exited API Fetch Process is restarted
+)
+
+# --- GLOBAL RENDER SCHEDULING ---
+render_wakeup_event = (
+    threading.Event()
+)  # Wakes the Render Worker when there is new data
+COUNTDOWN_CHANGE_MARGIN = 0.05  # Seconds to wake after a countdown is due to change
+render_counts = {"rendered": 0, "skipped": 0}  # Render Worker wake-ups by outcome
+RENDER_DURATION_WARNING = 0.5  # Seconds a render may take before a warning is logged
+
+# --- GLOBAL IDLE MODE STATE (see idle_reason) ---
+board_idle = False
+awake_event = threading.Event()  # Cleared while idle, pausing the Render Worker
+awake_event.set()
+arrivals_empty_since = None  # Monotonic time since which every fetch found no arrivals
+idle_wake_until = 0  # Monotonic time before which the board stays awake
+ACTIVE_CONTRAST = 0x7F  # luma.oled's default SSD1322 contrast
 
 # --- GLOBAL BUFFER FOR FINAL DISPLAY OUTPUT ---
 display_output_buffer: Image.Image = None
@@ -50,13 +151,28 @@ display_output_buffer: Image.Image = None
 # --- GLOBAL DISPLAY DEVICE ---
 display_device = None  # Initialize display_device to None
 
+# --- GLOBAL FRAME STREAMER (only created when config.stream_port is set) ---
+frame_streamer = None
+STREAM_KEEPALIVE_INTERVAL = 15  # Seconds after which idle streams are sent a keep-alive
+
 # --- GLOBAL DEFINITION OF ARRIVALS AREA AND CLOCK AREA OF DISPLAY ---
 arrivals_display_rect, clock_display_rect = None, None  # Initialize display rectangles
 
 # --- HELPER FUNCTIONS ---
 
 
+# Loaded fonts keyed by (name, size), so that every caller shares the same font objects.
+_font_cache = {}
+
+
 def make_Font(name: str, size: int) -> ImageFont.FreeTypeFont:
+    if (name, size) in _font_cache:
+        return _font_cache[(name, size)]
+    _font_cache[(name, size)] = _load_font(name, size)
+    return _font_cache[(name, size)]
+
+
+def _load_font(name: str, size: int) -> ImageFont.FreeTypeFont:
     font_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "fonts", name))
     try:
         return ImageFont.truetype(font_path, size, layout_engine=ImageFont.Layout.BASIC)
@@ -73,10 +189,11 @@ def initialize_fonts():
     fontBold = make_Font("Dot Matrix Bold.ttf", config.fontSize)
 
 
-def get_time_to_arrival(arrival, font):
-    """Calculates the time to arrival and formats it for display."""
+def get_time_to_arrival(arrival, font, now: float = None):
+    """Calculates the time to arrival (at epoch time now, by default the current time) and formats it for display."""
 
-    seconds_to_arrival = int(arrival["arrival_time"].timestamp() - time.time())
+    now = time.time() if now is None else now
+    seconds_to_arrival = int(arrival["arrival_time"].timestamp() - now)
     time_to_arrival = " "  # Default value if not displayed
     time_width = 0  # Default value if not displayed
 
@@ -103,6 +220,464 @@ def get_time_to_arrival(arrival, font):
     return time_to_arrival, time_width, display_check
 
 
+def next_countdown_change(arrival, now: float) -> float:
+    """
+    Returns the epoch time after now at which the text get_time_to_arrival shows
+    for this arrival next changes, or None if it is no longer displayed.
+    """
+    arrival_epoch = arrival["arrival_time"].timestamp()
+    seconds_to_arrival = int(arrival_epoch - now)
+    earliest_seconds = config.earliest_arrival * 60
+    if seconds_to_arrival < earliest_seconds:
+        return None
+
+    # Values of seconds_to_arrival below which the text changes: the arrival is
+    # hidden below earliest_seconds, shows "due" below 61 and the rounded
+    # minutes drop at every 60k + 30 seconds (e.g. "2 min" becomes "1 min" at 89).
+    thresholds = [earliest_seconds, 61]
+    if seconds_to_arrival >= 90:
+        thresholds.append(60 * ((seconds_to_arrival - 30) // 60) + 30)
+    next_threshold = max(
+        threshold for threshold in thresholds if threshold <= seconds_to_arrival
+    )
+    # int(arrival_epoch - t) drops below next_threshold once t passes this time.
+    # int() truncates towards zero, so a threshold of 0 is only crossed a second later.
+    if next_threshold <= 0:
+        return arrival_epoch - next_threshold + 1
+    return arrival_epoch - next_threshold
+
+
+# --- MEMORY REPORTING ---
+
+
+def read_process_memory() -> dict:
+    """Reads the current (VmRSS) and peak (VmHWM) resident set size in kB from /proc."""
+    memory = {}
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":", 1)
+                    memory[key] = int(value.split()[0])
+    except OSError:
+        pass  # Not on Linux, only the tracemalloc figures are reported
+    return memory
+
+
+def log_memory_report():
+    """Prints a tracemalloc snapshot of the largest allocation sites and the process RSS."""
+    if not tracemalloc.is_tracing():
+        return
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+    )
+    current, peak = tracemalloc.get_traced_memory()
+    memory = read_process_memory()
+    print(
+        f"DEBUG Memory: traced {current / 1024:.1f} kB (peak {peak / 1024:.1f} kB), "
+        f"RSS {memory.get('VmRSS', '?')} kB (peak {memory.get('VmHWM', '?')} kB)"
+    )
+    for stat in snapshot.statistics("lineno")[: config.memory_report_top]:
+        frame = stat.traceback[0]
+        print(
+            f"DEBUG Memory:   {stat.size / 1024:8.1f} kB in {stat.count:6d} blocks "
+            f"at {frame.filename}:{frame.lineno}"
+        )
+
+
+# --- SAMPLING PROFILER ---
+# Started and stopped with SIGUSR1, e.g.
+#     sudo systemctl kill -s SIGUSR1 tube-departure-board.service
+# While stopped, no sampler thread runs, so profiling costs nothing.
+
+# Names of the threads whose stacks are sampled.
+PROFILED_THREADS = (
+    "Main",
+    "API Fetch Worker",
+    "API Fetch Process",
+    "Arrival Pipe Worker",
+    "Render Worker",
+)
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of the PROFILED_THREADS config.profiler_sample_hz times
+    a second and counts how often each stack was seen. When stopped, the counts
+    are written as collapsed stacks ("thread;outer;...;inner count" per line),
+    the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self):
+        self._stop_event = None  # Set to stop the running sampler thread
+
+    def toggle(self, signum=None, frame=None):
+        """Starts or stops sampling. Installed as the SIGUSR1 handler."""
+        if self._stop_event is None:
+            if config.profiler_sample_hz <= 0:
+                print("WARNING Profiler: Disabled by profiler_sample_hz in config.py.")
+                return
+            self._stop_event = threading.Event()
+            threading.Thread(
+                target=self._run,
+                args=(self._stop_event,),
+                name="Profiler",
+                daemon=True,
+            ).start()
+        else:
+            # The sampler thread writes the output itself, so the handler returns at once
+            self._stop_event.set()
+            self._stop_event = None
+
+    def _run(self, stop_event: threading.Event):
+        interval = 1.0 / config.profiler_sample_hz
+        stack_counts = {}
+        samples = 0
+        started = time.time()
+        print(
+            f"DEBUG Profiler: Sampling {', '.join(PROFILED_THREADS)} at {config.profiler_sample_hz} Hz."
+        )
+        while not stop_event.wait(interval):
+            thread_names = {
+                thread.ident: thread.name
+                for thread in threading.enumerate()
+                if thread.name in PROFILED_THREADS
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id not in thread_names:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                stack.append(thread_names[thread_id])
+                key = ";".join(reversed(stack))
+                stack_counts[key] = stack_counts.get(key, 0) + 1
+            samples += 1
+
+        try:
+            self._write(stack_counts, started)
+            print(
+                f"DEBUG Profiler: Stopped after {samples} samples in {time.time() - started:.1f}s."
+            )
+        except OSError as e:
+            print(f"ERROR Profiler: Could not write the profile: {e}")
+
+    def _write(self, stack_counts: dict, started: float):
+        os.makedirs(config.profiler_output_dir, exist_ok=True)
+        path = os.path.join(
+            config.profiler_output_dir,
+            f"profile-{datetime.fromtimestamp(started).strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.folded",
+        )
+        with open(path, "w") as f:
+            for stack, count in sorted(stack_counts.items()):
+                f.write(f"{stack} {count}\n")
+        print(f"DEBUG Profiler: Wrote {len(stack_counts)} stacks to {path}.")
+
+
+PROFILER = SamplingProfiler()
+
+
+def install_profiler_signal_handler():
+    """Makes SIGUSR1 start and stop the profiler. Must be called from the main thread."""
+    if hasattr(signal, "SIGUSR1"):  # Not available on Windows
+        signal.signal(signal.SIGUSR1, PROFILER.toggle)
+
+
+# --- HTTP TRANSPORT ---
+# Every TfL request goes through TFL_TRANSPORT, which keeps connections alive in a
+# sized pool, negotiates compression, caches DNS lookups and stops calling an
+# endpoint that keeps failing.
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failures of one endpoint. After config.circuit_breaker_failures
+    failures the circuit opens and calls are refused until config.circuit_breaker_reset
+    seconds have passed, after which a single trial call is let through.
+    """
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None  # Monotonic time the circuit opened, None while closed
+        self.trial_in_progress = False
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_in_progress:
+                return False
+            if time.monotonic() - self.opened_at >= config.circuit_breaker_reset:
+                self.trial_in_progress = True  # Half-open: let one call through
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_progress = False
+
+    def record_failure(self) -> bool:
+        """Records a failure and returns True if it opened the circuit."""
+        with self.lock:
+            self.failures += 1
+            was_open = self.opened_at is not None
+            if was_open or self.failures >= config.circuit_breaker_failures:
+                self.opened_at = time.monotonic()
+            self.trial_in_progress = False
+            return not was_open and self.opened_at is not None
+
+
+class DnsCache:
+    """
+    Caches the results of socket.getaddrinfo for config.dns_cache_ttl seconds.
+    If a lookup fails, the last known addresses are used, so a flaky resolver
+    does not stop requests to an already known host. Only the connections of
+    the TfL transport resolve through it (see CachedDnsConnectionMixin).
+    """
+
+    def __init__(self):
+        self.entries = {}  # getaddrinfo arguments -> (expiry time, result)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def getaddrinfo(self, host, *args, **kwargs):
+        key = (host, args, tuple(sorted(kwargs.items())))
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        try:
+            result = socket.getaddrinfo(host, *args, **kwargs)
+        except OSError:
+            if entry:
+                print(f"Warning: DNS lookup for {host} failed, using cached address.")
+                return entry[1]
+            raise
+        with self.lock:
+            self.entries[key] = (time.monotonic() + config.dns_cache_ttl, result)
+        return result
+
+    def forget(self, host, *args, **kwargs):
+        """Drops the cached addresses of a lookup, so the next one asks the resolver."""
+        with self.lock:
+            self.entries.pop((host, args, tuple(sorted(kwargs.items()))), None)
+
+
+class TflTransport:
+    """
+    The shared HTTP transport for all TfL API requests. Also counts requests,
+    new connections (each costing a TCP and TLS handshake) and the bytes saved
+    by compression, which log_report() prints.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            }
+        )
+        self.adapter = KeepAliveAdapter(
+            pool_connections=config.http_pool_size,
+            pool_maxsize=config.http_pool_size,
+            max_retries=0,  # query_TFL handles retries
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.circuit_breakers = {}
+        self.dns_cache = DNS_CACHE
+        self.stats_lock = threading.Lock()
+        self.requests = 0
+        self.handshakes = 0
+        self.bytes_received = 0  # As sent over the network, i.e. compressed
+        self.bytes_decoded = 0
+        self.circuit_opens = 0
+        self.refused_requests = 0
+        self.pool_connection_counts = {}  # Connection pool key -> connections counted
+        self.last_report = time.monotonic()
+
+    def get(self, url: str, params: dict = None, timeout: float = 10):
+        """
+        Sends a GET request. Raises CircuitOpenError without sending anything if
+        the endpoint has failed too often recently.
+        """
+        split_url = urllib.parse.urlsplit(url)
+        path_segments = split_url.path.strip("/").split("/")
+        # e.g. /StopPoint/940GZZLUSKS/Arrivals -> api.tfl.gov.uk/StopPoint/Arrivals
+        endpoint = "/".join([split_url.netloc, path_segments[0], path_segments[-1]])
+        breaker = self.circuit_breakers.setdefault(endpoint, CircuitBreaker())
+        if not breaker.allow_request():
+            with self.stats_lock:
+                self.refused_requests += 1
+            raise CircuitOpenError(
+                f"Not calling {endpoint} after repeated failures, retrying in up to "
+                f"{config.circuit_breaker_reset}s."
+            )
+
+        try:
+            response = self.session.get(url, params=params, timeout=timeout)
+            content = response.content  # Reads the whole body
+        except requests.exceptions.RequestException:
+            self.record_failure(breaker, endpoint)
+            raise
+        finally:
+            self.count_new_connections()
+
+        with self.stats_lock:
+            self.requests += 1
+            self.bytes_received += response.raw.tell()
+            self.bytes_decoded += len(content)
+        if response.status_code >= 500 or response.status_code == 429:
+            self.record_failure(breaker, endpoint)
+        else:
+            breaker.record_success()
+        return response
+
+    def record_failure(self, breaker: CircuitBreaker, endpoint: str):
+        if breaker.record_failure():
+            with self.stats_lock:
+                self.circuit_opens += 1
+            print(f"WARNING Transport: Circuit opened for {endpoint}.")
+
+    def count_new_connections(self):
+        """Adds the connections opened by the connection pools since the last count."""
+        pools = self.adapter.poolmanager.pools
+        with self.stats_lock:
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue  # Evicted since keys() was read
+                counted = self.pool_connection_counts.get(key, 0)
+                self.handshakes += pool.num_connections - counted
+                self.pool_connection_counts[key] = pool.num_connections
+
+    def log_report(self):
+        with self.stats_lock:
+            reused = self.requests - self.handshakes
+            print(
+                f"DEBUG Transport: {self.requests} requests, {self.handshakes} handshakes "
+                f"({max(reused, 0)} requests reused a connection), "
+                f"{self.bytes_received / 1024:.1f} kB received for "
+                f"{self.bytes_decoded / 1024:.1f} kB of JSON "
+                f"({(self.bytes_decoded - self.bytes_received) / 1024:.1f} kB saved by compression), "
+                f"{self.circuit_opens} circuit opens, {self.refused_requests} requests refused, "
+                f"DNS cache {self.dns_cache.hits} hits / {self.dns_cache.misses} lookups."
+            )
+
+    def log_report_if_due(self):
+        """Logs a report every config.transport_report_interval seconds (0 disables)."""
+        if (
+            config.transport_report_interval > 0
+            and time.monotonic() - self.last_report >= config.transport_report_interval
+        ):
+            self.last_report = time.monotonic()
+            self.log_report()
+
+
+class CachedDnsConnectionMixin:
+    """
+    Makes a urllib3 connection resolve its host through DNS_CACHE, then connect
+    to the cached addresses in turn. TLS still verifies the original host name.
+    """
+
+    def _new_conn(self):
+        lookup = (self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        try:
+            addresses = DNS_CACHE.getaddrinfo(*lookup)
+        except OSError:
+            addresses = []
+        if not addresses:
+            return super()._new_conn()  # Resolves and reports failures as urllib3 does
+
+        error = None
+        for address in dict.fromkeys(sockaddr[0] for *_, sockaddr in addresses):
+            try:
+                sock = create_connection(
+                    (address, self.port),
+                    self.timeout,
+                    source_address=self.source_address,
+                    socket_options=self.socket_options,
+                )
+            except OSError as e:
+                error = e
+                continue
+            sys.audit("http.client.connect", self, self.host, self.port)
+            return sock
+
+        # Every cached address failed, so resolve the host again next time
+        DNS_CACHE.forget(*lookup)
+        if isinstance(error, socket.timeout):
+            raise ConnectTimeoutError(
+                self,
+                f"Connection to {self.host} timed out. (connect timeout={self.timeout})",
+            ) from error
+        raise NewConnectionError(
+            self, f"Failed to establish a new connection: {error}"
+        ) from error
+
+
+class CachedDnsHTTPConnection(CachedDnsConnectionMixin, HTTPConnection):
+    pass
+
+
+class CachedDnsHTTPSConnection(CachedDnsConnectionMixin, HTTPSConnection):
+    pass
+
+
+class CachedDnsHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDnsHTTPConnection
+
+
+class CachedDnsHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDnsHTTPSConnection
+
+
+class KeepAliveAdapter(requests.adapters.HTTPAdapter):
+    """
+    An HTTPAdapter that enables TCP keep-alive, so dead connections are noticed
+    quickly, and resolves hosts through DNS_CACHE.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        socket_options = list(HTTPConnection.default_socket_options)
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if hasattr(socket, "TCP_KEEPIDLE"):  # Not available on macOS
+            socket_options.append(
+                (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, config.http_keepalive_idle)
+            )
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10))
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3))
+        kwargs["socket_options"] = socket_options
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CachedDnsHTTPConnectionPool,
+            "https": CachedDnsHTTPSConnectionPool,
+        }
+
+
+DNS_CACHE = DnsCache()
+TFL_TRANSPORT = TflTransport()
+
+
 # --- API INTERACTION FUNCTIONS ---
 
 
@@ -110,14 +685,13 @@ def query_TFL(
     url: str,
     params: dict = None,
     max_retries: int = 3,
-    _session: requests.Session = None,
+    object_hook=None,
 ) -> list:
-    session_to_use = _session if _session else requests.Session()
     for retry_attempt in range(max_retries):
         try:
-            response = session_to_use.get(url, params=params, timeout=10)
+            response = TFL_TRANSPORT.get(url, params=params, timeout=10)
             response.raise_for_status()
-            json_response = response.json()
+            json_response = response.json(object_hook=object_hook)
             return json_response if json_response else []
         except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
             print(
@@ -132,14 +706,13 @@ def query_TFL(
 
 
 def get_station_id(
-    _session: requests.Session = None,
     lines_filter1: set = None,
     lines_filter2: set = None,
 ) -> dict:
 
-    TFL_STOPPOINT_SEARCH_URL = "https://api.tfl.gov.uk/StopPoint/Search"
+    TFL_STOPPOINT_SEARCH_URL = config.api_base_url + "/StopPoint/Search"
     TFL_STOPPOINT_DETAIL_URL_BASE = (
-        "https://api.tfl.gov.uk/StopPoint/"  # Base URL for detail/children
+        config.api_base_url + "/StopPoint/"  # Base URL for detail/children
     )
 
     # 1. Search for the station ---
@@ -149,9 +722,7 @@ def get_station_id(
         "maxResults": 1,
         "app_key": config.api_key,
     }
-    search_response = query_TFL(
-        TFL_STOPPOINT_SEARCH_URL, params_search, _session=_session
-    )
+    search_response = query_TFL(TFL_STOPPOINT_SEARCH_URL, params_search)
 
     if (
         not search_response
@@ -172,7 +743,6 @@ def get_station_id(
     detail_response = query_TFL(
         TFL_STOPPOINT_DETAIL_URL_BASE + search_result_id,
         params_detail,
-        _session=_session,
     )
 
     if not detail_response:
@@ -227,18 +797,142 @@ def check_lines(lines, lines_filter1, lines_filter2):
     return all_filtered_lines_to_check.issubset(served_lines)
 
 
-def get_lines_filter(lines_config_list: list, _session: requests.Session = None) -> set:
-    TFL_LINE_SEARCH_URL = "https://api.tfl.gov.uk/Line/Search/"
-    filter_set = set()
+def fetch_line_catalogue() -> dict:
+    """
+    Downloads every line of the modes in config.line_modes with a single
+    /Line/Mode request and saves it to config.line_catalogue_file.
+    """
+    TFL_LINE_MODE_URL = (
+        config.api_base_url + "/Line/Mode/" + ",".join(config.line_modes)
+    )
     params = {
         "app_key": config.api_key,
     }
+    mode_response = query_TFL(TFL_LINE_MODE_URL, params)
+    lines = {
+        line["id"]: line.get("name", line["id"])
+        for line in (mode_response if isinstance(mode_response, list) else [])
+        if isinstance(line, dict) and isinstance(line.get("id"), str)
+    }
+    if not lines:
+        raise RuntimeError(f"No lines were returned for modes: {config.line_modes}.")
+
+    catalogue = {
+        "fetched_at": time.time(),
+        "modes": list(config.line_modes),
+        "lines": lines,
+    }
+    try:
+        temp_path = config.line_catalogue_file + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(catalogue, f)
+        os.replace(temp_path, config.line_catalogue_file)
+    except OSError as e:
+        print(
+            f"Warning: Could not save line catalogue to {config.line_catalogue_file}: {e}"
+        )
+    return catalogue
+
+
+def read_line_catalogue() -> dict:
+    """Reads the cached line catalogue, or returns None if there is no usable cache."""
+    try:
+        with open(config.line_catalogue_file, "r") as f:
+            catalogue = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not (
+        isinstance(catalogue, dict)
+        and isinstance(catalogue.get("fetched_at"), (int, float))
+        and isinstance(catalogue.get("lines"), dict)
+    ):
+        return None  # Not a catalogue written by fetch_line_catalogue
+    if catalogue.get("modes") != list(config.line_modes):
+        return None  # Cached for a different set of modes
+    return catalogue
+
+
+def line_catalogue_is_stale(catalogue: dict) -> bool:
+    return time.time() - catalogue["fetched_at"] > config.line_catalogue_max_age
+
+
+def get_line_catalogue() -> dict:
+    """
+    Returns the line catalogue, downloading it when the cached copy is missing or
+    older than config.line_catalogue_max_age. A stale copy is still used if the
+    download fails.
+    """
+    global line_catalogue, line_catalogue_next_attempt
+    if line_catalogue is None:
+        line_catalogue = read_line_catalogue()
+    if line_catalogue is None or (
+        line_catalogue_is_stale(line_catalogue)
+        and time.time() >= line_catalogue_next_attempt
+    ):
+        try:
+            line_catalogue = fetch_line_catalogue()
+            print(
+                f"DEBUG Line Catalogue: Downloaded {len(line_catalogue['lines'])} lines."
+            )
+        except RuntimeError as e:
+            if line_catalogue is None:
+                raise
+            line_catalogue_next_attempt = time.time() + LINE_CATALOGUE_RETRY_INTERVAL
+            print(f"Warning: Using stale line catalogue, refresh failed: {e}")
+    return line_catalogue
+
+
+def refresh_line_catalogue_if_stale():
+    """Refreshes an already loaded line catalogue once it is stale. Called periodically by the workers."""
+    if line_catalogue is not None:
+        get_line_catalogue()
+
+
+def normalise_line_name(name: str) -> str:
+    """Normalises a line name or id so that e.g. "Hammersmith & City" matches "hammersmith-city"."""
+    name = name.lower().replace("&", " ").replace("-", " ")
+    if name.endswith(" line"):
+        name = name[: -len(" line")]
+    return " ".join(name.split())
+
+
+def find_line_id(line_name: str, catalogue: dict) -> str:
+    """Looks up the TfL line id for a configured line name, or returns None."""
+    wanted = normalise_line_name(line_name)
+    for line_id, name in catalogue["lines"].items():
+        if wanted in (normalise_line_name(line_id), normalise_line_name(name)):
+            return line_id
+    return None
+
+
+def get_lines_filter(lines_config_list: list) -> set:
+    """
+    Resolves the configured lines to (line id, direction) pairs using the line
+    catalogue. Only names missing from the catalogue fall back to /Line/Search.
+    Resolved entries are remembered, so a config reload only resolves new lines.
+    """
+    filter_set = set()
     for entry in lines_config_list:
+        key = (entry.get("line"), entry.get("direction"))
+        if key not in resolved_line_entries:
+            resolved_line_entries[key] = resolve_line_entry(entry)
+        if resolved_line_entries[key]:
+            filter_set.add(resolved_line_entries[key])
+    return filter_set
+
+
+def resolve_line_entry(entry: dict) -> tuple:
+    """Resolves one lines1/lines2 entry to a (line id, direction) pair, or None."""
+    TFL_LINE_SEARCH_URL = config.api_base_url + "/Line/Search/"
+    params = {
+        "app_key": config.api_key,
+    }
 
+    line = find_line_id(entry.get("line"), get_line_catalogue())
+    if line is None:
         search_response = query_TFL(
             TFL_LINE_SEARCH_URL + entry.get("line"),
             params,
-            _session=_session,
         )
 
         if not search_response.get("searchMatches"):
@@ -247,21 +941,138 @@ def get_lines_filter(lines_config_list: list, _session: requests.Session = None)
             )
 
         line = search_response["searchMatches"][0]["lineId"]
-        direction_substring = entry.get("direction")
-        if line and direction_substring:
-            filter_set.add((line.lower(), direction_substring.lower()))
-    return filter_set
+    direction_substring = entry.get("direction")
+    if line and direction_substring:
+        return (line.lower(), direction_substring.lower())
+    return None
+
+
+def get_line_statuses(line_ids: set) -> dict:
+    """
+    Fetches the status of all the given lines with a single /Line/{ids}/Status
+    request. Returns {line id: {"name", "severity", "description"}}, using the
+    most severe status (lowest statusSeverity) reported for each line.
+    """
+    if not line_ids:
+        return {}
+    TFL_LINE_STATUS_URL = (
+        config.api_base_url + "/Line/" + ",".join(sorted(line_ids)) + "/Status"
+    )
+    params = {
+        "app_key": config.api_key,
+    }
+    status_response = query_TFL(TFL_LINE_STATUS_URL, params)
+    line_statuses = {}
+    for line in status_response if isinstance(status_response, list) else []:
+        statuses = line.get("lineStatuses") or []
+        if not statuses:
+            continue
+        worst = min(statuses, key=lambda status: status.get("statusSeverity", 10))
+        line_statuses[line["id"]] = {
+            "name": line.get("name", line["id"]),
+            "severity": worst.get("statusSeverity", 10),
+            "description": worst.get("statusSeverityDescription", ""),
+        }
+    return line_statuses
+
+
+def get_status_messages(line_statuses: dict, lines_filter: set) -> list:
+    """Returns e.g. ["District: Minor Delays"] for the filtered lines without a good service."""
+    line_ids = sorted({line_id for line_id, _ in lines_filter})
+    return [
+        f"{line_statuses[line_id]['name']}: {line_statuses[line_id]['description']}"
+        for line_id in line_ids
+        if line_id in line_statuses
+        and line_statuses[line_id]["severity"] != GOOD_SERVICE_SEVERITY
+    ]
+
+
+# Fields of a TfL arrival prediction that get_arrivals needs after filtering.
+ARRIVAL_FIELDS = (
+    "towards",
+    "destinationName",
+    "expectedArrival",
+    "timeToStation",
+    "lineName",
+)
+
+# Prediction fields filter_predictions() matches on
+FILTER_FIELDS = ("lineId", "platformName")
+
+
+def trim_prediction(obj: dict) -> dict:
+    """
+    json object_hook used in lean mode. Reduces each prediction to the fields
+    the board uses while the payload is parsed, so the full predictions never
+    exist in memory all at once.
+    """
+    if "timeToStation" not in obj:
+        return obj
+    return {key: obj[key] for key in FILTER_FIELDS + ARRIVAL_FIELDS if key in obj}
+
+
+def filter_predictions(all_arrivals: list, filter_criteria_set: set) -> list:
+    """
+    Returns the predictions matching the line/direction filter, reduced to
+    ARRIVAL_FIELDS so that the raw JSON does not need to be kept around.
+    """
+    return [
+        # In lean mode trim_prediction() already reduced the predictions
+        p if config.lean_mode else {key: p[key] for key in ARRIVAL_FIELDS if key in p}
+        for p in all_arrivals
+        if (
+            (p_line := p.get("lineId", "").lower())
+            and (p_platform := p.get("platformName", "").lower())
+            and p.get("timeToStation", float("inf")) >= config.earliest_arrival * 60
+            and any(
+                f_line == p_line and f_direction_substring in p_platform
+                for f_line, f_direction_substring in filter_criteria_set
+            )
+        )
+    ]
+
+
+def format_arrivals(filtered_predictions: list, n: int = 7) -> list:
+    """Sorts the filtered predictions and converts the first n into display records."""
+    filtered_sorted_arrivals = sorted(
+        filtered_predictions, key=lambda p: p.get("timeToStation", math.inf)
+    )
+    final_display_info = []
+    for arrival in filtered_sorted_arrivals[:n]:
+        destination = arrival.get("towards") or arrival.get("destinationName")
+        destination = destination if destination else "Unknown Destination"
+        expected_arrival_utc_str = arrival.get("expectedArrival")
+        arrival_dt = None
+        if expected_arrival_utc_str:
+            try:
+                naive_dt = datetime.strptime(
+                    expected_arrival_utc_str, "%Y-%m-%dT%H:%M:%SZ"
+                )
+                arrival_dt = naive_dt.replace(tzinfo=pytz.utc)
+            except ValueError:
+                print(
+                    f"Warning: Could not parse expectedArrival: {expected_arrival_utc_str}"
+                )
+        if arrival_dt is not None:
+            final_display_info.append(
+                {
+                    "destination": destination,
+                    "arrival_time": arrival_dt,
+                    "timeToStation": arrival.get("timeToStation"),
+                    "lineName": arrival.get("lineName"),
+                }
+            )
+    return final_display_info
 
 
 def get_arrivals(
     station: dict,
     filter_criteria_set: set,
     n: int = 7,
-    _session: requests.Session = None,
 ) -> list:
     try:
         TFL_STOPPOINT_ARRIVALS_URL = (
-            "https://api.tfl.gov.uk/StopPoint/" + station["id"] + "/Arrivals"
+            config.api_base_url + "/StopPoint/" + station["id"] + "/Arrivals"
         )
         # TFL_STOPPOINT_ARRIVALS_URL = (
         #     "https://api.tfl.gov.uk/Line/district/Arrivals/" + station["id"]
@@ -271,62 +1082,100 @@ def get_arrivals(
             "app_key": config.api_key,
         }
         # print(params)
-        all_arrivals = query_TFL(TFL_STOPPOINT_ARRIVALS_URL, params, _session=_session)
+        all_arrivals = query_TFL(
+            TFL_STOPPOINT_ARRIVALS_URL,
+            params,
+            object_hook=trim_prediction if config.lean_mode else None,
+        )
         # print(json.dumps(all_arrivals, indent=2))
         if not isinstance(all_arrivals, list):
             return []
-        filtered_predictions = [
-            p
-            for p in all_arrivals
-            if (
-                (p_line := p.get("lineId", "").lower())
-                and (p_platform := p.get("platformName", "").lower())
-                and p.get("timeToStation", float("inf")) >= config.earliest_arrival * 60
-                and any(
-                    f_line == p_line and f_direction_substring in p_platform
-                    for f_line, f_direction_substring in filter_criteria_set
-                )
-            )
-        ]
-        filtered_sorted_arrivals = sorted(
-            filtered_predictions, key=lambda p: p.get("timeToStation", math.inf)
-        )
-        final_display_info = []
-        for arrival in filtered_sorted_arrivals[:n]:
-            destination = arrival.get("towards") or arrival.get("destinationName")
-            destination = destination if destination else "Unknown Destination"
-            expected_arrival_utc_str = arrival.get("expectedArrival")
-            arrival_dt = None
-            if expected_arrival_utc_str:
-                try:
-                    naive_dt = datetime.strptime(
-                        expected_arrival_utc_str, "%Y-%m-%dT%H:%M:%SZ"
-                    )
-                    arrival_dt = naive_dt.replace(tzinfo=pytz.utc)
-                except ValueError:
-                    print(
-                        f"Warning: Could not parse expectedArrival: {expected_arrival_utc_str}"
-                    )
-            if arrival_dt is not None:
-                final_display_info.append(
-                    {
-                        "destination": destination,
-                        "arrival_time": arrival_dt,
-                        "timeToStation": arrival.get("timeToStation"),
-                        "lineName": arrival.get("lineName"),
-                    }
-                )
-        return final_display_info
+        filtered_predictions = filter_predictions(all_arrivals, filter_criteria_set)
+        del all_arrivals  # Free the raw JSON straight away
+        if config.lean_mode:
+            gc.collect()
+        return format_arrivals(filtered_predictions, n)
     except Exception as e:
         print(f"An unexpected error occurred in get_arrivals: {e}")
         return []
 
 
+def pack_arrivals(arrivals: list) -> list:
+    """Converts display records into compact tuples for sending between processes."""
+    return [
+        (
+            arrival["destination"],
+            arrival["arrival_time"].timestamp(),
+            arrival["timeToStation"],
+            arrival["lineName"],
+        )
+        for arrival in arrivals
+    ]
+
+
+def unpack_arrivals(packed_arrivals: list) -> list:
+    """Converts compact tuples from pack_arrivals back into display records."""
+    return [
+        {
+            "destination": destination,
+            "arrival_time": datetime.fromtimestamp(arrival_epoch, tz=pytz.utc),
+            "timeToStation": time_to_station,
+            "lineName": line_name,
+        }
+        for destination, arrival_epoch, time_to_station, line_name in packed_arrivals
+    ]
+
+
 # --- DISPLAY DRAWING FUNCTIONS ---
 # These functions draw content onto a 'draw_obj' (PIL.ImageDraw.Draw) directly,
 # which is typically the off-screen buffer of the Render Worker thread.
 
 
+def compute_layout():
+    """
+    Computes the arrivals and clock rectangles and the x offset of the line names
+    from the fonts, config.lines1 and config.display_settings.
+    """
+    global arrivals_display_rect, clock_display_rect, layout_version
+    bbox_clock = fontBold.getbbox("00:00:00")
+    clock_width = bbox_clock[2] - bbox_clock[0]
+    clock_height = bbox_clock[3] - bbox_clock[1]
+
+    if len(config.lines1) > 1:
+        line_width = 0
+        for line in config.lines1:
+            bbox_line = font.getbbox(line["line"])
+            line_width = max(line_width, bbox_line[2] - bbox_line[0])
+        bbox_arrival_time = font.getbbox("XX min")
+        arrival_time_width = bbox_arrival_time[2] - bbox_arrival_time[0]
+        config.display_settings["xoffset_line_name"] = (
+            display_device.width
+            - arrival_time_width
+            - line_width
+            - config.display_settings["xoffset"]
+            - config.display_settings["space_line_name_arrival_time"]
+        )
+
+    arrivals_display_rect = (
+        0,
+        0,
+        display_device.width,
+        display_device.height
+        - (
+            clock_height
+            + config.display_settings["yoffset"]
+            + config.display_settings["row_padding"]
+        ),  # minus 2 for padding,
+    )
+    clock_display_rect = (
+        (display_device.width - clock_width) / 2,
+        display_device.height - (clock_height + config.display_settings["yoffset"]),
+        (display_device.width + clock_width) / 2,
+        display_device.height,
+    )
+    layout_version += 1
+
+
 def draw_centered_text_rows(
     draw_obj: ImageDraw.ImageDraw,
     rows_text: list[str],
@@ -392,6 +1241,7 @@ def draw_pause_display(temp: float):
 def draw_clock(
     draw_obj: ImageDraw.ImageDraw,
     font: ImageFont.FreeTypeFont,
+    clock_format: str = "%H:%M:%S",
 ):
     """
     Draws the live clock at the bottom of the display onto the given draw object.
@@ -403,38 +1253,69 @@ def draw_clock(
         fill="black",
     )
 
-    clock_str = datetime.now(pytz.timezone("Europe/London")).strftime("%H:%M:%S")
+    clock_str = datetime.now(pytz.timezone("Europe/London")).strftime(clock_format)
+
+    # Centre formats shorter than "00:00:00" (e.g. "%H:%M") in the clock area. The
+    # zero-filled width is used, so the text doesn't shift as the digits change.
+    bbox_template = font.getbbox(datetime(2000, 1, 1).strftime(clock_format))
+    xpos = (
+        clock_display_rect[0]
+        + (
+            clock_display_rect[2]
+            - clock_display_rect[0]
+            - (bbox_template[2] - bbox_template[0])
+        )
+        / 2
+    )
 
     draw_obj.text(
-        (clock_display_rect[0], clock_display_rect[1]),
+        (xpos, clock_display_rect[1]),
         text=clock_str,
         font=font,
         fill="yellow",
     )
 
 
-def draw_arrival_lines(
-    draw_obj: ImageDraw.ImageDraw,
+def layout_arrival_rows(
     arrivals: list,
     font: ImageFont.FreeTypeFont,
-):
+    status_messages: list = None,
+    now: float = None,
+) -> list:
     """
-    Draws the list of arrival predictions on the main board area onto the global buffer.
-    It clears the entire arrivals area on the buffer before redrawing.
+    Lays out the arrival predictions (and status_messages, which take the last row)
+    as they should appear at epoch time now. Returns one (ypos, texts) pair per
+    row, where texts is a tuple of ((x, y), text) pairs.
     """
-
-    # Clear the entire arrivals display area on the buffer to black
-    draw_obj.rectangle(
-        arrivals_display_rect,
-        fill="black",
-    )
-
     max_y_for_arrivals = arrivals_display_rect[3]
+    row_height = config.fontSize + config.display_settings["row_padding"]
+    status_row = None
 
+    if status_messages:
+        # Reserve the last row that fits for the line status
+        status_row_num = math.ceil(
+            (max_y_for_arrivals - config.display_settings["yoffset"]) / row_height
+        )
+        max_y_for_arrivals = (
+            status_row_num - 1
+        ) * row_height + config.display_settings["yoffset"]
+        status_row = (
+            max_y_for_arrivals,
+            (
+                (
+                    (config.display_settings["xoffset"], max_y_for_arrivals),
+                    " / ".join(status_messages),
+                ),
+            ),
+        )
+
+    rows = []
     row_num = 1
 
     for arrival in arrivals:
-        time_to_arrival, time_width, display_check = get_time_to_arrival(arrival, font)
+        time_to_arrival, time_width, display_check = get_time_to_arrival(
+            arrival, font, now
+        )
 
         if display_check:
             ypos = (row_num - 1) * (
@@ -444,66 +1325,602 @@ def draw_arrival_lines(
             if ypos >= max_y_for_arrivals:
                 break
 
-            draw_obj.text(
-                (config.display_settings["xoffset"], ypos),
-                text=str(row_num),
-                font=font,
-                fill="yellow",
-            )
-            draw_obj.text(
+            texts = [
+                ((config.display_settings["xoffset"], ypos), str(row_num)),
                 (
-                    config.display_settings["xoffset"]
-                    + config.display_settings["space_arrival_num_dest_name"],
-                    ypos,
+                    (
+                        config.display_settings["xoffset"]
+                        + config.display_settings["space_arrival_num_dest_name"],
+                        ypos,
+                    ),
+                    arrival["destination"],
                 ),
-                text=arrival["destination"],
-                font=font,
-                fill="yellow",
-            )
+            ]
 
             if len(config.lines1) > 1:
                 # If multiple lines are configured, display the line name
                 # at the end of the row.
-                draw_obj.text(
+                texts.append(
                     (
-                        config.display_settings["xoffset_line_name"],
-                        ypos,
-                    ),
-                    text=arrival["lineName"],
-                    font=font,
-                    fill="yellow",
+                        (config.display_settings["xoffset_line_name"], ypos),
+                        arrival["lineName"],
+                    )
                 )
 
-            draw_obj.text(
+            texts.append(
                 (
-                    display_device.width
-                    - time_width
-                    - config.display_settings["xoffset"],
-                    ypos,
-                ),
-                text=time_to_arrival,
-                font=font,
-                fill="yellow",
+                    (
+                        display_device.width
+                        - time_width
+                        - config.display_settings["xoffset"],
+                        ypos,
+                    ),
+                    time_to_arrival,
+                )
             )
+            rows.append((ypos, tuple(texts)))
             row_num += 1
 
+    if status_row:
+        rows.append(status_row)
+    return rows
+
+
+def draw_arrival_lines(
+    draw_obj: ImageDraw.ImageDraw,
+    arrivals: list,
+    font: ImageFont.FreeTypeFont,
+    status_messages: list = None,
+    drawn_rows: list = None,
+    now: float = None,
+) -> list:
+    """
+    Draws the list of arrival predictions on the main board area onto the global buffer.
+    If there are status_messages, the last row shows them instead of an arrival.
+    drawn_rows are the rows returned by the previous call for the same buffer: only
+    rows that differ from them are cleared and redrawn. Without drawn_rows, the
+    entire arrivals area is cleared and redrawn. Returns the rows now drawn.
+    """
+    rows = layout_arrival_rows(arrivals, font, status_messages, now)
+
+    if drawn_rows is None:
+        # Clear the entire arrivals display area on the buffer to black
+        draw_obj.rectangle(
+            arrivals_display_rect,
+            fill="black",
+        )
+        drawn_rows = []
+
+    # Rows sit on a fixed grid, so compare what is drawn at each row position
+    row_height = config.fontSize + config.display_settings["row_padding"]
+    texts_by_ypos = dict(rows)
+    drawn_texts_by_ypos = dict(drawn_rows)
+    for ypos in sorted(texts_by_ypos.keys() | drawn_texts_by_ypos.keys()):
+        if texts_by_ypos.get(ypos) == drawn_texts_by_ypos.get(ypos):
+            continue
+
+        # Clear this row on the buffer to black
+        draw_obj.rectangle(
+            (
+                arrivals_display_rect[0],
+                ypos,
+                arrivals_display_rect[2],
+                min(ypos + row_height - 1, arrivals_display_rect[3]),
+            ),
+            fill="black",
+        )
+        for position, text in texts_by_ypos.get(ypos, ()):
+            draw_obj.text(position, text=text, font=font, fill="yellow")
+
+    return rows
+
+
+# --- REMOTE FRAME STREAMING ---
+# An optional HTTP server (config.stream_port) that shows what the board is displaying.
+
+
+class FrameStreamer:
+    """
+    Shares the frames pushed to the display with the frame server.
+    The display loop only hands over the raw frame bytes. Change detection runs
+    on the streamer's own thread, and each changed frame is encoded at most once
+    per format, with the cached encoding served to every viewer.
+    """
+
+    def __init__(self, mode: str, size: tuple):
+        self.mode = mode
+        self.size = size
+        self.version = 0  # Incremented whenever the frame content changes
+        self.encode_count = 0
+        self._submitted = None
+        self._submitted_event = threading.Event()
+        self._frame_bytes = None
+        self._encoded = {}  # Encodings of the current version, keyed by format
+        self._changed = threading.Condition()
+        self._encode_lock = threading.Lock()
+
+    def submit(self, image: Image.Image):
+        """Hands a frame over from the display loop. Never waits for encoding or viewers."""
+        self._submitted = image.tobytes()
+        self._submitted_event.set()
+
+    def run(self):
+        """Detects changed frames. Runs on its own daemon thread."""
+        while True:
+            self._submitted_event.wait()
+            self._submitted_event.clear()
+            frame_bytes = self._submitted
+            if frame_bytes == self._frame_bytes:
+                continue
+            with self._changed:
+                with self._encode_lock:
+                    self._frame_bytes = frame_bytes
+                    self._encoded = {}
+                    self.version += 1
+                self._changed.notify_all()
+
+    def wait_for_change(self, last_version: int, timeout: float) -> int:
+        """Blocks until the frame differs from last_version or timeout expires, then returns the version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != last_version, timeout)
+            return self.version
+
+    def get_encoded(self, image_format: str) -> tuple:
+        """Returns (version, encoded bytes) of the current frame as "PNG", "JPEG" or "SSE"."""
+        with self._encode_lock:
+            if self._frame_bytes is None:
+                return self.version, None
+            if image_format not in self._encoded:
+                if image_format == "SSE":
+                    png_bytes = self._encode("PNG")
+                    self._encoded["SSE"] = (
+                        b"data: data:image/png;base64,"
+                        + base64.b64encode(png_bytes)
+                        + b"\n\n"
+                    )
+                else:
+                    self._encode(image_format)
+            return self.version, self._encoded[image_format]
+
+    def _encode(self, image_format: str) -> bytes:
+        # Must be called with _encode_lock held
+        if image_format not in self._encoded:
+            image = Image.frombytes(self.mode, self.size, self._frame_bytes)
+            if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            output = io.BytesIO()
+            image.save(output, format=image_format)
+            self._encoded[image_format] = output.getvalue()
+            self.encode_count += 1
+        return self._encoded[image_format]
+
+
+def make_frame_request_handler(streamer: FrameStreamer):
+    """Creates the HTTP request handler class serving frames from streamer."""
+    from http.server import BaseHTTPRequestHandler
+
+    class FrameRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            try:
+                if path == "/":
+                    self.send_index()
+                elif path == "/frame.png":
+                    self.send_frame()
+                elif path == "/stream.mjpg":
+                    self.send_mjpeg_stream()
+                elif path == "/events":
+                    self.send_event_stream()
+                else:
+                    self.send_error(404)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The viewer disconnected
+
+        def send_index(self):
+            body = (
+                b"<!DOCTYPE html><html><head><title>Departure Board</title></head>"
+                b'<body style="background:#000"><img src="/stream.mjpg" '
+                b'style="width:100%;image-rendering:pixelated"></body></html>'
+            )
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_frame(self):
+            version, png_bytes = streamer.get_encoded("PNG")
+            if png_bytes is None:
+                self.send_error(503, "No frame has been displayed yet")
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(png_bytes)))
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("ETag", f'"{version}"')
+            self.end_headers()
+            self.wfile.write(png_bytes)
+
+        def send_mjpeg_stream(self):
+            self.send_response(200)
+            self.send_header(
+                "Content-Type", "multipart/x-mixed-replace; boundary=frame"
+            )
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            version = -1
+            while True:
+                version, jpeg_bytes = streamer.get_encoded("JPEG")
+                if jpeg_bytes is not None:
+                    self.wfile.write(
+                        b"--frame\r\nContent-Type: image/jpeg\r\n"
+                        + f"Content-Length: {len(jpeg_bytes)}\r\n\r\n".encode()
+                        + jpeg_bytes
+                        + b"\r\n"
+                    )
+                    self.wfile.flush()
+                # Re-sends the same frame after the timeout to keep the connection alive
+                streamer.wait_for_change(version, timeout=STREAM_KEEPALIVE_INTERVAL)
+
+        def send_event_stream(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            version = -1
+            while True:
+                new_version = streamer.wait_for_change(
+                    version, timeout=STREAM_KEEPALIVE_INTERVAL
+                )
+                if new_version == version:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    version, event_bytes = streamer.get_encoded("SSE")
+                    if event_bytes is not None:
+                        self.wfile.write(event_bytes)
+                self.wfile.flush()
+
+        def log_message(self, format, *args):
+            pass  # Viewers connecting should not flood the service log
+
+    return FrameRequestHandler
+
+
+def start_frame_server(streamer: FrameStreamer, host: str, port: int):
+    """Starts the frame server and the streamer's change detection on daemon threads."""
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), make_frame_request_handler(streamer))
+    server.daemon_threads = True
+    threading.Thread(target=streamer.run, daemon=True).start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- CONFIG HOT RELOAD ---
+# config.py is watched while the board runs, and only the parts affected by a
+# change are recomputed, without restarting the worker threads.
+
+# Settings that are only read at startup, so changing them needs a restart.
+RESTART_REQUIRED_SETTINGS = (
+    "displayRotation",
+    "switch_GPIO_pin",
+    "lean_mode",
+    "memory_report_interval",
+    "fetch_mode",
+    "stream_port",
+    "stream_host",
+    "http_pool_size",
+    "http_keepalive_idle",
+)
+
+# Settings that change the geometry computed by compute_layout().
+LAYOUT_SETTINGS = ("display_settings", "fontSize", "lines1")
+
+# Settings read by the API Fetch Process, which reloads config.py only when
+# one of these (or its targets) changed.
+FETCH_SETTINGS = (
+    "earliest_arrival",
+    "refresh_interval_TFL",
+    "idle_refresh_interval_TFL",
+    "api_key",
+    "api_base_url",
+    "line_modes",
+    "line_catalogue_file",
+    "line_catalogue_max_age",
+    "show_line_status",
+    "refresh_interval_status",
+    "dns_cache_ttl",
+    "circuit_breaker_failures",
+    "circuit_breaker_reset",
+    "transport_report_interval",
+    "profiler_sample_hz",
+    "profiler_output_dir",
+)
+
+
+def load_config_module() -> types.ModuleType:
+    """Executes config.py into a new module, so the live config is untouched if it has errors."""
+    spec = importlib.util.spec_from_file_location("config", config.__file__)
+    new_config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(new_config)
+    return new_config
+
+
+def config_values(config_module: types.ModuleType) -> dict:
+    """Returns the settings defined in a config module."""
+    values = {
+        name: value
+        for name, value in vars(config_module).items()
+        if not name.startswith("_") and not isinstance(value, types.ModuleType)
+    }
+    # xoffset_line_name is computed by compute_layout(), not configured
+    values["display_settings"] = {
+        key: value
+        for key, value in values.get("display_settings", {}).items()
+        if key != "xoffset_line_name"
+    }
+    return values
+
+
+def reload_config():
+    """
+    Reloads config.py and applies only what changed: fonts and geometry for
+    layout settings, line resolution for new lines1/lines2 entries, and the
+    station lookup for a new station (or a new set of lines). The workers pick
+    up the new station and filters from board_targets.
+    """
+    global board_targets, config_version
+    old_values = config_values(config)
+    new_values = config_values(load_config_module())
+    changed = {
+        name
+        for name in old_values.keys() | new_values.keys()
+        if old_values.get(name) != new_values.get(name)
+    }
+    if not changed:
+        return
+    print(f"DEBUG Config Watcher: Changed settings: {', '.join(sorted(changed))}.")
+    for name in sorted(changed.intersection(RESTART_REQUIRED_SETTINGS)):
+        print(
+            f"WARNING Config Watcher: Changing '{name}' only takes effect after a restart."
+        )
+
+    with config_lock:
+        # Only replace changed settings. config.display_settings also holds the
+        # xoffset_line_name computed by compute_layout(), which new_values lacks.
+        vars(config).update(
+            {name: new_values[name] for name in changed if name in new_values}
+        )
+        if "fontSize" in changed:
+            initialize_fonts()
+        if changed.intersection(LAYOUT_SETTINGS):
+            compute_layout()
+            print("DEBUG Config Watcher: Display layout recomputed.")
+
+    targets = board_targets
+    new_targets = dict(targets)
+    try:
+        if "lines1" in changed or "lines2" in changed:
+            new_targets["lines_filter1"] = get_lines_filter(config.lines1)
+            new_targets["lines_filter2"] = get_lines_filter(config.lines2)
+        if "station" in changed or monitored_line_ids(
+            new_targets["lines_filter1"], new_targets["lines_filter2"]
+        ) != monitored_line_ids(targets["lines_filter1"], targets["lines_filter2"]):
+            new_targets["station_info"] = get_station_id(
+                lines_filter1=new_targets["lines_filter1"],
+                lines_filter2=new_targets["lines_filter2"],
+            )
+            print(
+                f"DEBUG Config Watcher: Station resolved to {new_targets['station_info']['name']}."
+            )
+    except RuntimeError as e:
+        print(f"ERROR Config Watcher: {e} Keeping the previous station and lines.")
+        new_targets = targets
+
+    board_targets = new_targets
+    config_version += 1
+    render_wakeup_event.set()  # Redraw with the new layout and line filters
+    if fetch_control_conn is not None:
+        if new_targets != targets or changed.intersection(FETCH_SETTINGS):
+            send_fetch_control(("reload", new_targets))
+    elif new_targets != targets:
+        fetch_wakeup_event.set()  # Fetch arrivals for the new station or lines now
+
+
+def config_watch_worker():
+    """Polls the modification time of config.py and reloads it when it changes."""
+    last_mtime = os.stat(config.__file__).st_mtime
+    while True:
+        time.sleep(max(config.config_watch_interval, 1))
+        try:
+            mtime = os.stat(config.__file__).st_mtime
+            if mtime == last_mtime:
+                continue
+            last_mtime = mtime
+            reload_config()
+        except Exception as e:
+            print(f"ERROR Config Watcher: Could not apply config change: {e}")
+
+
+# --- IDLE MODE ---
+# Off-peak (during config.idle_schedule, or once no arrivals have been found for
+# config.idle_after_empty seconds) the board only shows a dimmed clock, the
+# Render Worker is paused and arrivals are only fetched every
+# config.idle_refresh_interval_TFL seconds. A restart or a switch toggle wakes
+# the board for config.idle_wake_duration seconds.
+
+
+def in_idle_schedule(now: datetime) -> bool:
+    """Whether now falls in one of the ("HH:MM", "HH:MM") periods of config.idle_schedule."""
+    current = now.strftime("%H:%M")
+    for start, end in config.idle_schedule:
+        if start <= end:
+            if start <= current < end:
+                return True
+        elif current >= start or current < end:  # The period spans midnight
+            return True
+    return False
+
+
+def idle_reason() -> str:
+    """Returns why the board should idle now ("schedule" or "no arrivals"), or None."""
+    if time.monotonic() < idle_wake_until:
+        return None
+    if in_idle_schedule(datetime.now(pytz.timezone("Europe/London"))):
+        return "schedule"
+    if (
+        config.idle_after_empty > 0
+        and arrivals_empty_since is not None
+        and time.monotonic() - arrivals_empty_since >= config.idle_after_empty
+    ):
+        return "no arrivals"
+    return None
+
+
+def wake_board():
+    """Keeps the board awake for the next config.idle_wake_duration seconds."""
+    global idle_wake_until
+    idle_wake_until = time.monotonic() + config.idle_wake_duration
+
+
+def fetch_interval(idle: bool) -> float:
+    return config.idle_refresh_interval_TFL if idle else config.refresh_interval_TFL
+
+
+def send_fetch_control(message: tuple):
+    """
+    Sends a message to the API Fetch Process ("process" fetch mode). If the
+    process has exited, the message is dropped: its replacement starts with the
+    current targets and idle state.
+    """
+    with fetch_control_lock:
+        try:
+            fetch_control_conn.send(message)
+        except OSError as e:
+            print(f"WARNING Main: API Fetch Process did not get '{message[0]}': {e}")
+
+
+class UsageMeter:
+    """
+    Measures the CPU time and TfL requests of this process while the board is
+    awake and while it idles, and logs how much each idle period saved compared
+    to the rate of the awake period before it.
+    """
+
+    def __init__(self, component: str):
+        self.component = component
+        self.awake_rates = None  # (CPU seconds, requests) per second while awake
+        self._start_phase()
+
+    def _start_phase(self):
+        self.phase_start = (
+            time.monotonic(),
+            time.process_time(),
+            TFL_TRANSPORT.requests,
+        )
+
+    def switch(self, idle: bool):
+        """Records the end of an awake (idle is True) or idle (idle is False) period."""
+        elapsed = max(time.monotonic() - self.phase_start[0], 1e-9)
+        cpu_time = time.process_time() - self.phase_start[1]
+        requests_made = TFL_TRANSPORT.requests - self.phase_start[2]
+        if idle:
+            self.awake_rates = (cpu_time / elapsed, requests_made / elapsed)
+        elif self.awake_rates is not None:
+            expected_cpu_time = self.awake_rates[0] * elapsed
+            expected_requests = self.awake_rates[1] * elapsed
+            used = f"{cpu_time:.1f}s CPU time"
+            saved = f"{max(expected_cpu_time - cpu_time, 0):.1f}s CPU time"
+            # The display process makes no arrival requests in "process" fetch mode
+            if requests_made or expected_requests:
+                used += f" and {requests_made} TfL requests"
+                saved += (
+                    f" and {max(expected_requests - requests_made, 0):.0f} requests"
+                )
+            print(
+                f"DEBUG {self.component}: Idled for {elapsed / 60:.1f} min using {used}. "
+                f"Saved about {saved} compared to full cadence."
+            )
+        self._start_phase()
+
+
+def set_board_idle(reason: str, usage_meter: UsageMeter):
+    """Switches the board to idle mode (reason is not None) or back to full cadence."""
+    global board_idle
+    board_idle = reason is not None
+    usage_meter.switch(board_idle)
+    if board_idle:
+        print(f"DEBUG Main: Idling ({reason}).")
+        awake_event.clear()
+        ImageDraw.Draw(display_output_buffer).rectangle(
+            (0, 0) + display_output_buffer.size, fill="black"
+        )
+        display_device.contrast(config.idle_contrast)
+    else:
+        print("DEBUG Main: Resuming full cadence.")
+        display_device.contrast(ACTIVE_CONTRAST)
+        awake_event.set()
+        render_wakeup_event.set()
+    if fetch_control_conn is not None:
+        send_fetch_control(("idle", board_idle))
+    elif not board_idle:
+        fetch_wakeup_event.set()  # Fetch fresh arrivals now
+
 
 # --- BACKGROUND WORKER THREAD FUNCTIONS ---
 # These threads run in the background, performing API fetches and rendering.
 
 
-def api_fetch_worker(
-    station_info: dict,
-    lines_filter1: set,
-    lines_filter2: set,
-    pause_event: threading.Event,
-):
+def publish_arrivals(new_arrivals1: list, new_arrivals2: list):
+    """Replaces the arrivals waiting for the Render Worker with the latest fetched ones."""
+    global arrivals_empty_since
+    if new_arrivals1 or new_arrivals2:
+        arrivals_empty_since = None
+    elif arrivals_empty_since is None:
+        arrivals_empty_since = time.monotonic()
+
+    if (new_arrivals1, new_arrivals2) == arrivals_snapshot.value:
+        return  # Nothing new to render
+    # Both sets are published together, so they are always rendered from the same fetch
+    arrivals_snapshot.publish((new_arrivals1, new_arrivals2))
+    render_wakeup_event.set()
+    print("DEBUG API Fetch Worker: New raw API data published.")
+
+
+def publish_line_statuses(line_statuses: dict):
+    """Replaces the line statuses waiting for the Render Worker with the latest fetched ones."""
+    if line_statuses == line_status_snapshot.value:
+        return  # Nothing new to render
+    line_status_snapshot.publish(line_statuses)
+    render_wakeup_event.set()
+    print("DEBUG API Fetch Worker: New line statuses published.")
+
+
+def line_statuses_due(last_status_fetch: float) -> bool:
+    """Whether the line statuses should be fetched, given the monotonic time of the last fetch."""
+    return config.show_line_status and (
+        last_status_fetch is None
+        or time.monotonic() - last_status_fetch >= config.refresh_interval_status
+    )
+
+
+def monitored_line_ids(lines_filter1: set, lines_filter2: set) -> set:
+    return {line_id for line_id, _ in lines_filter1 | lines_filter2}
+
+
+def api_fetch_worker(pause_event: threading.Event):
     """
-    Fetches raw API data periodically and puts it into raw_api_data_queue.
+    Fetches raw API data periodically and publishes it to arrivals_snapshot.
     This thread performs Task 3: fetching new API data every 30 seconds.
     """
+    last_status_fetch = None  # Monotonic time of the last line status fetch
+
     while True:
         pause_event.wait()  # Blocks until pause_event is set
+        station_info = board_targets["station_info"]
+        lines_filter1 = board_targets["lines_filter1"]
+        lines_filter2 = board_targets["lines_filter2"]
         try:
             print(
                 f"DEBUG API Fetch Worker: Fetching new raw API data at {datetime.now().strftime('%H:%M:%S')}..."
@@ -512,120 +1929,337 @@ def api_fetch_worker(
             new_arrivals1 = get_arrivals(
                 station_info,
                 lines_filter1,
-                _session=API_SESSION,
             )
 
             new_arrivals2 = get_arrivals(
                 station_info,
                 lines_filter2,
-                _session=API_SESSION,
             )
 
-            try:
-                # Clear any old data in queue, ensuring only the latest is available
-                while not raw_api_data_queue1.empty():
-                    raw_api_data_queue1.get_nowait()
-                raw_api_data_queue1.put_nowait(new_arrivals1)
+            publish_arrivals(new_arrivals1, new_arrivals2)
 
-                while not raw_api_data_queue2.empty():
-                    raw_api_data_queue2.get_nowait()
-                raw_api_data_queue2.put_nowait(new_arrivals2)
-
-                print(
-                    "DEBUG API Fetch Worker: New raw API data successfully put into queue."
-                )
-            except queue.Full:
-                print(
-                    "WARNING API Fetch Worker: Raw API data queue was full, render worker too slow. Data dropped."
+            if not board_idle and line_statuses_due(last_status_fetch):
+                last_status_fetch = time.monotonic()
+                publish_line_statuses(
+                    get_line_statuses(
+                        monitored_line_ids(lines_filter1, lines_filter2),
+                    )
                 )
 
+            refresh_line_catalogue_if_stale()
+            TFL_TRANSPORT.log_report_if_due()
+
         except Exception as e:
             print(
                 f"ERROR API Fetch Worker: Data fetch failed: {e}. Retrying after sleep."
             )
 
-        time.sleep(config.refresh_interval_TFL)
+        # Sleeps until the next fetch, or until a config reload or the end of idle mode
+        fetch_wakeup_event.wait(fetch_interval(board_idle))
+        fetch_wakeup_event.clear()
+
+
+def api_fetch_process(
+    targets: dict,
+    pause_event,
+    conn,
+    control_conn,
+):
+    """
+    Runs in a child process when config.fetch_mode is "process".
+    Fetches and parses arrivals like api_fetch_worker, but sends them as compact
+    records through conn, so that parsing a large payload never holds the GIL
+    of the process that draws the clock and pushes frames to the display.
+    Config reloads and their new targets arrive through control_conn.
+    """
+    global TFL_TRANSPORT
+    TFL_TRANSPORT = TflTransport()  # Never share the parent's open connections
+    threading.current_thread().name = "API Fetch Process"
+    install_profiler_signal_handler()  # This process writes its own profiles
+    last_status_fetch = None  # Monotonic time of the last line status fetch
+    idle = False
+    usage_meter = UsageMeter("API Fetch Process")
+
+    while True:
+        pause_event.wait()  # Blocks until pause_event is set
+        station_info = targets["station_info"]
+        lines_filter1 = targets["lines_filter1"]
+        lines_filter2 = targets["lines_filter2"]
+        try:
+            print(
+                f"DEBUG API Fetch Process: Fetching new raw API data at {datetime.now().strftime('%H:%M:%S')}..."
+            )
+            new_arrivals1 = get_arrivals(
+                station_info,
+                lines_filter1,
+            )
+            new_arrivals2 = get_arrivals(
+                station_info,
+                lines_filter2,
+            )
+            conn.send(
+                ("arrivals", pack_arrivals(new_arrivals1), pack_arrivals(new_arrivals2))
+            )
+
+            if not idle and line_statuses_due(last_status_fetch):
+                last_status_fetch = time.monotonic()
+                conn.send(
+                    (
+                        "line_statuses",
+                        get_line_statuses(
+                            monitored_line_ids(lines_filter1, lines_filter2),
+                        ),
+                    )
+                )
+            TFL_TRANSPORT.log_report_if_due()
+        except (BrokenPipeError, EOFError):
+            return  # The display process has exited
+        except Exception as e:
+            print(
+                f"ERROR API Fetch Process: Data fetch failed: {e}. Retrying after sleep."
+            )
+
+        # Sleeps until the next fetch, or until the display process sends a reload
+        # or wakes the board from idle mode
+        try:
+            while control_conn.poll(fetch_interval(idle)):
+                message = control_conn.recv()
+                if message[0] == "reload":
+                    vars(config).update(config_values(load_config_module()))
+                    targets = message[1]
+                    break
+                elif message[0] == "idle":
+                    idle = message[1]
+                    usage_meter.switch(idle)
+                    if not idle:
+                        break
+        except EOFError:
+            return  # The display process has exited
+        except Exception as e:
+            print(f"ERROR API Fetch Process: Could not apply config change: {e}")
+
+
+def arrival_pipe_worker(conn):
+    """
+    Receives the messages sent by api_fetch_process and publishes their
+    arrivals and line statuses for the Render Worker.
+    """
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            print("ERROR Arrival Pipe Worker: API Fetch Process has exited.")
+            return
+        if message[0] == "arrivals":
+            publish_arrivals(unpack_arrivals(message[1]), unpack_arrivals(message[2]))
+            try:
+                refresh_line_catalogue_if_stale()
+            except Exception as e:
+                print(f"ERROR Arrival Pipe Worker: Line catalogue refresh failed: {e}")
+        elif message[0] == "line_statuses":
+            publish_line_statuses(message[1])
+
+
+def start_api_fetch_process(pause_event):
+    """
+    Starts api_fetch_process for the current board_targets, connects
+    fetch_control_conn to it and returns the process and the pipe it sends on.
+    """
+    import multiprocessing
+
+    global fetch_control_conn
+    targets = board_targets
+    receive_conn, send_conn = multiprocessing.Pipe(duplex=False)
+    control_receive_conn, control_send_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=api_fetch_process,
+        args=(
+            targets,
+            pause_event,
+            send_conn,
+            control_receive_conn,
+        ),
+        daemon=True,
+    )
+    process.start()
+    send_conn.close()  # Only the child process sends arrivals
+    control_receive_conn.close()  # Only the child process receives reloads
+
+    with fetch_control_lock:
+        if fetch_control_conn is not None:
+            fetch_control_conn.close()
+        fetch_control_conn = control_send_conn
+    # Catch up with a reload or idle mode that happened while the process started
+    if board_targets is not targets:
+        send_fetch_control(("reload", board_targets))
+    if board_idle:
+        send_fetch_control(("idle", True))
+    return process, receive_conn
+
+
+def api_fetch_process_supervisor(pause_event):
+    """
+    Runs the API Fetch Process and passes its messages to arrival_pipe_worker.
+    Restarts the process whenever it exits, e.g. when it was killed for using
+    too much memory, so that the board never keeps showing stale arrivals.
+    """
+    while True:
+        process, receive_conn = start_api_fetch_process(pause_event)
+        print(
+            f"DEBUG Arrival Pipe Worker: API Fetch Process started (pid {process.pid})."
+        )
+        arrival_pipe_worker(receive_conn)  # Returns when the process has exited
+        receive_conn.close()
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()  # Closed its pipe without exiting
+            process.join()
+        print(
+            f"ERROR Arrival Pipe Worker: API Fetch Process exited with code {process.exitcode}. "
+            f"Restarting it in {FETCH_PROCESS_RESTART_DELAY}s."
+        )
+        time.sleep(FETCH_PROCESS_RESTART_DELAY)
 
 
 def arrival_lines_worker(pause_event: threading.Event):
     """
     This thread is responsible for drawing all display elements onto an off-screen buffer.
-    It takes raw API data from the API fetcher and renders full frames (clock + arrivals),
-    then puts completed frames into rendered_frames_queue for the main thread.
-    This thread handles Task 2 (drawing arrivals at 1 FPS) and preparing clock updates (part of Task 1).
+    It takes the latest arrivals published by the API fetcher and renders full frames,
+    then publishes the frames that changed to rendered_frames_snapshot for the main thread.
+    Only rows whose text changed are redrawn, and the thread sleeps until new data
+    arrives or until the next countdown ("N min") on the board is due to change.
+    Wake-ups without a new snapshot, config or countdown change skip rendering.
     """
 
-    # Private buffer and drawing handle for this worker thread
-    # render_buffer = Image.new(display_device.mode, display_device.size)
-    # render_draw_handle = ImageDraw.Draw(render_buffer)
+    # Private buffers and drawing handles for this worker thread
     render_buffer1 = Image.new(display_device.mode, display_device.size)
     render_draw_handle1 = ImageDraw.Draw(render_buffer1)
     render_buffer2 = Image.new(display_device.mode, display_device.size)
     render_draw_handle2 = ImageDraw.Draw(render_buffer2)
 
-    # Variables for state of arrivals data consumed from API Fetch Worker
-    current_arrivals1 = []
-    current_arrivals2 = []
+    # Rows currently drawn on each buffer (None redraws the whole arrivals area)
+    drawn_rows1 = None
+    drawn_rows2 = None
+    rendered_layout_version = layout_version
 
-    # Timing for rendering arrivals (Task 2: e.g., 0.5 FPS)
-    arrivals_render_interval = config.refresh_interval_display
+    # Snapshot and config versions of the last render, and when it happened
+    rendered_versions = None
+    rendered_at = 0
+    next_change_time = math.inf  # Epoch time of the next countdown change on the board
 
     while True:
 
         pause_event.wait()  # Blocks until pause_event is set
+        awake_event.wait()  # Blocks while the board idles
 
         loop_start_time = time.monotonic()
 
-        # --- Get latest raw API data (non-blocking) ---
         try:
-            current_arrivals1 = raw_api_data_queue1.get_nowait()
-            current_arrivals2 = raw_api_data_queue2.get_nowait()
-            print("DEBUG Render Worker: Consumed new raw API data from queue.")
-        except queue.Empty:
-            pass  # No new raw API data, use existing
+            # --- Get the latest snapshots (non-blocking) ---
+            now = time.time()
+            arrivals_version, arrivals = arrivals_snapshot.get()
+            current_arrivals1, current_arrivals2 = arrivals
+            status_version, current_line_statuses = line_status_snapshot.get()
+            input_versions = (arrivals_version, status_version, config_version)
+
+            # Skip rendering when nothing changed since the last render. A clock that
+            # jumped backwards since then still renders.
+            if (
+                input_versions == rendered_versions
+                and rendered_at <= now < next_change_time
+            ):
+                render_counts["skipped"] += 1
+            else:
+                # --- Draw Arrival Lines  ---
+                with config_lock:
+                    if rendered_layout_version != layout_version:
+                        # The geometry was recomputed, clear everything drawn with the old one
+                        rendered_layout_version = layout_version
+                        render_draw_handle1.rectangle(
+                            (0, 0) + render_buffer1.size, fill="black"
+                        )
+                        render_draw_handle2.rectangle(
+                            (0, 0) + render_buffer2.size, fill="black"
+                        )
+                        drawn_rows1 = drawn_rows2 = None
+
+                    rows1 = draw_arrival_lines(
+                        render_draw_handle1,
+                        current_arrivals1,
+                        font=font,
+                        status_messages=get_status_messages(
+                            current_line_statuses, board_targets["lines_filter1"]
+                        ),
+                        drawn_rows=drawn_rows1,
+                        now=now,
+                    )
 
-        # --- Draw Arrival Lines  ---
+                    rows2 = draw_arrival_lines(
+                        render_draw_handle2,
+                        current_arrivals2,
+                        font=font,
+                        status_messages=get_status_messages(
+                            current_line_statuses, board_targets["lines_filter2"]
+                        ),
+                        drawn_rows=drawn_rows2,
+                        now=now,
+                    )
 
-        draw_arrival_lines(
-            render_draw_handle1,
-            current_arrivals1,
-            font=font,
-        )
+                # --- Publish COPIES of the frames that changed for the main thread ---
+                if rows1 != drawn_rows1 or rows2 != drawn_rows2:
+                    frame1, frame2 = rendered_frames_snapshot.value
+                    rendered_frames_snapshot.publish(
+                        (
+                            render_buffer1.copy() if rows1 != drawn_rows1 else frame1,
+                            render_buffer2.copy() if rows2 != drawn_rows2 else frame2,
+                        )
+                    )
+                    print(
+                        "DEBUG Render Worker: display with updated arrival lines published."
+                    )
+                drawn_rows1, drawn_rows2 = rows1, rows2
+                render_counts["rendered"] += 1
+                rendered_versions = input_versions
+                rendered_at = now
+                next_change_time = min(
+                    (
+                        change_time
+                        for arrival in current_arrivals1 + current_arrivals2
+                        if (change_time := next_countdown_change(arrival, now))
+                        is not None
+                    ),
+                    default=math.inf,
+                )
 
-        draw_arrival_lines(
-            render_draw_handle2,
-            current_arrivals2,
-            font=font,
+            render_duration = time.monotonic() - loop_start_time
+            if render_duration > RENDER_DURATION_WARNING:
+                print(
+                    f"WARNING Render Worker: Took too long ({render_duration:.3f}s) for {RENDER_DURATION_WARNING:.3f}s budget."
+                )
+        except Exception as e:
+            print(f"ERROR Render Worker: Render failed: {e}. Retrying after sleep.")
+            # Redraw the whole arrivals area next time, as rows may be half drawn
+            drawn_rows1 = drawn_rows2 = None
+            next_change_time = math.inf
+
+        # Sleep until new data arrives or the next countdown on the board changes.
+        # refresh_interval_display caps the sleep in case the system clock jumps.
+        sleep_time = min(
+            config.refresh_interval_display,
+            max(next_change_time - time.time(), 0) + COUNTDOWN_CHANGE_MARGIN,
         )
+        render_wakeup_event.wait(sleep_time)
+        render_wakeup_event.clear()
 
-        # --- Put the completed frame COPY into the output queue for the main thread ---
-        try:
-            while not rendered_frames_queue1.empty():
-                rendered_frames_queue1.get_nowait()
-            rendered_frames_queue1.put_nowait(render_buffer1.copy())
-            while not rendered_frames_queue2.empty():
-                rendered_frames_queue2.get_nowait()
-            rendered_frames_queue2.put_nowait(
-                render_buffer2.copy()
-            )  # Put a COPY to avoid race conditions
 
-            print(
-                f"DEBUG Render Worker: display with updated arrival lines put into queue."
-            )
-        except queue.Full:
-            print(
-                "WARNING Render Worker: Rendered frames queue was full, main thread too slow to consume."
-            )
-
-        # Sleep to control render worker's own FPS
-        render_duration = time.monotonic() - loop_start_time
-        sleep_time = arrivals_render_interval - render_duration
-        if sleep_time > 0:
-            time.sleep(sleep_time)
-        else:
-            print(
-                f"WARNING Render Worker: Took too long ({render_duration:.3f}s) for {arrivals_render_interval:.3f}s budget."
-            )
+def memory_report_worker():
+    """Logs a tracemalloc memory report every config.memory_report_interval seconds."""
+    while True:
+        time.sleep(config.memory_report_interval)
+        try:
+            log_memory_report()
+        except Exception as e:
+            print(f"ERROR Memory Report Worker: Report failed: {e}")
 
 
 # --- MAIN EXECUTION LOGIC (PRIMARY DISPLAY THREAD) ---
@@ -633,6 +2267,8 @@ def main():
 
     try:
 
+        threading.current_thread().name = "Main"
+        install_profiler_signal_handler()
         initialize_fonts()
 
         # --- Display Device Initialization ---
@@ -644,59 +2280,41 @@ def main():
             GPIO.setup(config.switch_GPIO_pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
         else:
             print("DEBUG Main: Initializing Pygame emulator...")
+            from luma.emulator.device import pygame
+
             display_device = pygame(width=256, height=64, rotate=config.displayRotation)
 
         # --- GLOBAL ARRIVAL LINES AND CLOCK RECTANGLES INITIALIZATION ---
-        global arrivals_display_rect, clock_display_rect
-        bbox_clock = fontBold.getbbox("00:00:00")
-        clock_width = bbox_clock[2] - bbox_clock[0]
-        clock_height = bbox_clock[3] - bbox_clock[1]
-
-        if len(config.lines1) > 1:
-            line_width = 0
-            for line in config.lines1:
-                bbox_line = font.getbbox(line["line"])
-                line_width = max(line_width, bbox_line[2] - bbox_line[0])
-            bbox_arrival_time = font.getbbox("XX min")
-            arrival_time_width = bbox_arrival_time[2] - bbox_arrival_time[0]
-            config.display_settings["xoffset_line_name"] = (
-                display_device.width
-                - arrival_time_width
-                - line_width
-                - config.display_settings["xoffset"]
-                - config.display_settings["space_line_name_arrival_time"]
-            )
-
-        arrivals_display_rect = (
-            0,
-            0,
-            display_device.width,
-            display_device.height
-            - (
-                clock_height
-                + config.display_settings["yoffset"]
-                + config.display_settings["row_padding"]
-            ),  # minus 2 for padding,
-        )
-        clock_display_rect = (
-            (display_device.width - clock_width) / 2,
-            display_device.height - (clock_height + config.display_settings["yoffset"]),
-            (display_device.width + clock_width) / 2,
-            display_device.height,
-        )
+        compute_layout()
 
         # --- GLOBAL DISPLAY OUTPUT BUFFER INITIALIZATION ---
         global display_output_buffer
         display_output_buffer = Image.new(display_device.mode, display_device.size)
 
+        # --- Optional Remote Frame Server ---
+        if config.stream_port and config.lean_mode:
+            print(
+                "WARNING Main: The frame server is not started in lean mode, as it needs extra memory."
+            )
+        elif config.stream_port:
+            global frame_streamer
+            frame_streamer = FrameStreamer(display_device.mode, display_device.size)
+            start_frame_server(frame_streamer, config.stream_host, config.stream_port)
+            print(f"DEBUG Main: Frame server listening on port {config.stream_port}.")
+
         # --- Initial Data Fetch (Blocking, but only at startup) ---
+        global board_targets
         lines_filter1 = get_lines_filter(config.lines1)
         lines_filter2 = get_lines_filter(config.lines2)
         station_info = get_station_id(
-            _session=API_SESSION,
             lines_filter1=lines_filter1,
             lines_filter2=lines_filter2,
         )
+        board_targets = {
+            "station_info": station_info,
+            "lines_filter1": lines_filter1,
+            "lines_filter2": lines_filter2,
+        }
 
         print("DEBUG Main: Initial arrival data fetched.")
 
@@ -708,81 +2326,157 @@ def main():
 
         # --- Start Worker Threads ---
 
-        pause_event = threading.Event()
+        fetch_mode = config.fetch_mode
+        if config.lean_mode and fetch_mode == "process":
+            print(
+                "WARNING Main: Fetching in a thread, as fetch_mode 'process' needs a second Python process in lean mode."
+            )
+            fetch_mode = "thread"
+
+        if fetch_mode == "process":
+            import multiprocessing
+
+            pause_event = multiprocessing.Event()
+        else:
+            pause_event = threading.Event()
         pause_event.set()  # Set it so the thread starts in a 'resumed' state
 
-        api_fetch_thread = threading.Thread(
-            target=api_fetch_worker,
-            args=(
-                station_info,
-                lines_filter1,
-                lines_filter2,
-                pause_event,
-            ),
-            daemon=True,
-        )
-        api_fetch_thread.start()
-        print("DEBUG Main: API Fetch Worker started.")
+        if fetch_mode == "process":
+            arrival_pipe_thread = threading.Thread(
+                target=api_fetch_process_supervisor,
+                args=(pause_event,),
+                name="Arrival Pipe Worker",
+                daemon=True,
+            )
+            arrival_pipe_thread.start()
+            print("DEBUG Main: Arrival Pipe Worker started.")
+        else:
+            api_fetch_thread = threading.Thread(
+                target=api_fetch_worker,
+                args=(pause_event,),
+                name="API Fetch Worker",
+                daemon=True,
+            )
+            api_fetch_thread.start()
+            print("DEBUG Main: API Fetch Worker started.")
 
         arrival_lines_thread = threading.Thread(
             target=arrival_lines_worker,
             args=(pause_event,),
+            name="Render Worker",
             daemon=True,
         )
         arrival_lines_thread.start()
         print("DEBUG Main: Arrival Lines Worker started.")
 
+        if config.config_watch_interval > 0:
+            config_watch_thread = threading.Thread(
+                target=config_watch_worker,
+                name="Config Watcher",
+                daemon=True,
+            )
+            config_watch_thread.start()
+            print("DEBUG Main: Config Watcher started.")
+
+        if tracemalloc.is_tracing():
+            log_memory_report()
+            memory_report_thread = threading.Thread(
+                target=memory_report_worker,
+                name="Memory Report Worker",
+                daemon=True,
+            )
+            memory_report_thread.start()
+            print("DEBUG Main: Memory Report Worker started.")
+
         # --- Main Display Loop (TASK 1: Updates physical display) ---
         TARGET_DISPLAY_FPS = 5
         frame_time_budget = 1.0 / TARGET_DISPLAY_FPS
+        shown_frame = None  # The rendered frame on display_output_buffer
+        last_selected_frame = None  # Switch position in the previous loop
+        shown_idle_clock = None  # Clock text shown while idle
+        usage_meter = UsageMeter("Main")
+        wake_board()  # Start at full cadence, even during an idle period
 
         while True:
 
             loop_start_time = time.monotonic()
 
-            # --- Get new rendered frame from Render Worker (Non-blocking) ---
-            try:
-                if IS_RASPBERRY_PI:
-                    if GPIO.input(config.switch_GPIO_pin):
-                        new_rendered_frame = rendered_frames_queue1.get_nowait()
-                    else:
-                        new_rendered_frame = rendered_frames_queue2.get_nowait()
-
-                    # Monitor the raspberry pi's temperature
-                    with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
-                        temp = float(f.read().strip()) / 1000.0
-                    if temp > config.max_pi_temp:
-                        pause_event.clear()
-                        while temp > config.max_pi_temp - 3:
-                            draw_pause_display(temp)
-                            print("DEBUG Main: Sleeping for 10 seconds to cool down.")
-                            time.sleep(10)
-                            with open(
-                                "/sys/class/thermal/thermal_zone0/temp", "r"
-                            ) as f:
-                                temp = (
-                                    float(f.read().strip()) / 1000.0
-                                )  # The temperature is given in millidegrees Celsius, so divide by 1000
-                        pause_event.set()
+            # --- Get the latest rendered frames from Render Worker (Non-blocking) ---
+            # A frame is only replaced when its rows change, so an unchanged frame
+            # is the same object as the one already on display_output_buffer.
+            latest_frames = rendered_frames_snapshot.value
+
+            if IS_RASPBERRY_PI:
+                selected_frame = 0 if GPIO.input(config.switch_GPIO_pin) else 1
+
+                # Monitor the raspberry pi's temperature
+                with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
+                    temp = float(f.read().strip()) / 1000.0
+                if temp > config.max_pi_temp:
+                    pause_event.clear()
+                    while temp > config.max_pi_temp - 3:
+                        draw_pause_display(temp)
+                        print("DEBUG Main: Sleeping for 10 seconds to cool down.")
+                        time.sleep(10)
+                        with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
+                            temp = (
+                                float(f.read().strip()) / 1000.0
+                            )  # The temperature is given in millidegrees Celsius, so divide by 1000
+                    pause_event.set()
 
-                else:
-                    new_rendered_frame = rendered_frames_queue1.get_nowait()
+            else:
+                selected_frame = 0
 
+            # --- Idle Mode ---
+            if (
+                last_selected_frame is not None
+                and selected_frame != last_selected_frame
+            ):
+                wake_board()  # Someone toggled the switch
+            last_selected_frame = selected_frame
+
+            reason = idle_reason()
+            if (reason is not None) != board_idle:
+                set_board_idle(reason, usage_meter)
+                shown_frame = None  # Paste the selected frame again when resuming
+                shown_idle_clock = None
+
+            if board_idle:
+                # Only push the dimmed clock to the display when its minute changes
+                idle_clock = datetime.now(pytz.timezone("Europe/London")).strftime(
+                    "%H:%M"
+                )
+                if idle_clock != shown_idle_clock:
+                    with config_lock:
+                        draw_clock(
+                            ImageDraw.Draw(display_output_buffer),
+                            font=fontBold,
+                            clock_format="%H:%M",
+                        )
+                    display_device.display(display_output_buffer)
+                    if frame_streamer:
+                        frame_streamer.submit(display_output_buffer)
+                    shown_idle_clock = idle_clock
+                time.sleep(frame_time_budget)  # Keeps watching the switch
+                continue
+
+            selected_image = latest_frames[selected_frame]
+            if selected_image is not None and selected_image is not shown_frame:
                 # Paste the new frame onto the display_output_buffer
-                display_output_buffer.paste(new_rendered_frame, (0, 0))
+                display_output_buffer.paste(selected_image, (0, 0))
+                shown_frame = selected_image
                 print("DEBUG Main: Consumed new rendered frame from Render Worker.")
-            except queue.Empty:
-                pass  # No new frame yet, display the previous one.
 
                 # --- Draw Clock (always redraw, part of Task 1 preparation) ---
 
             render_draw_handle = ImageDraw.Draw(display_output_buffer)
 
             t1 = time.monotonic()
-            draw_clock(
-                render_draw_handle,
-                font=fontBold,
-            )
+            with config_lock:
+                draw_clock(
+                    render_draw_handle,
+                    font=fontBold,
+                )
             print(f"DEBUG Main: Clock drawn in {time.monotonic() - t1:.3f}s.")
 
             t2 = time.monotonic()
@@ -791,6 +2485,8 @@ def main():
             # This operation still takes ~0.5s on Pi for SSD1322, so physical FPS is capped.
             display_device.display(display_output_buffer)
             print(f"DEBUG Main: Display updated in {time.monotonic() - t2:.3f}s.")
+            if frame_streamer:
+                frame_streamer.submit(display_output_buffer)
             # --- Loop Timing and Control ---
             loop_end_time = time.monotonic()
             loop_duration = loop_end_time - loop_start_time